@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Measures the memory used by large alignments with each storage backend.
+
+Usage: python benchmarks/alignment_memory.py [LENGTH]
+"""
+
+from bistring import Alignment
+import sys
+import tracemalloc
+from typing import Callable
+
+
+def measure(create: Callable[[], Alignment]) -> int:
+    tracemalloc.start()
+    try:
+        alignment = create()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del alignment
+    return size
+
+
+def main() -> None:
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    # A character-level alignment with an insertion every 100 characters
+    edited = lambda: ((i, i + i // 100) for i in range(length + 1))
+    # An alignment where every character is edited, e.g. doubled
+    doubled = lambda: ((i, 2 * i) for i in range(length + 1))
+
+    print(f'{"storage":>8} {"identity":>14} {"edited":>14} {"doubled":>14} {"bytes/pair":>11}')
+    for storage in ['list', 'array']:
+        identity_size = measure(lambda: Alignment.identity(length, storage=storage))
+        edited_size = measure(lambda: Alignment(edited(), storage=storage))
+        doubled_size = measure(lambda: Alignment(doubled(), storage=storage))
+        per_pair = doubled_size / (length + 1)
+        print(f'{storage:>8} {identity_size:>14,} {edited_size:>14,} {doubled_size:>14,} {per_pair:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
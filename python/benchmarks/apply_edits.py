@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares BistrBuilder.apply_edits() to the equivalent sequence of skip() and replace() calls.
+
+Usage: python benchmarks/apply_edits.py [EDITS...]
+"""
+
+from bistring import BistrBuilder, bistr
+import random
+import sys
+import timeit
+
+
+def manual(text: bistr, edits: list) -> bistr:
+    builder = BistrBuilder(text)
+    for start, end, repl in edits:
+        builder.skip(start - builder.position)
+        builder.replace(end - start, repl)
+    builder.skip_rest()
+    return builder.build()
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+
+    rng = random.Random(0)
+
+    print(f'{"edits":>8} {"manual":>10} {"apply_edits":>12} {"sorted":>10} {"speedup":>8}')
+    for count in counts:
+        text = bistr(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(20 * count)))
+        positions = sorted(rng.sample(range(len(text)), 2 * count))
+        edits = [(start, end, 'x' * rng.randrange(4)) for start, end in zip(positions[::2], positions[1::2])]
+        shuffled = edits[:]
+        rng.shuffle(shuffled)
+
+        assert text.apply_edits(edits) == manual(text, edits)
+
+        slow = min(timeit.repeat(lambda: manual(text, edits), number=1, repeat=3))
+        fast = min(timeit.repeat(lambda: text.apply_edits(edits), number=1, repeat=3))
+        unsorted = min(timeit.repeat(lambda: text.apply_edits(shuffled, sort=True), number=1, repeat=3))
+
+        print(f'{count:>8} {slow:>9.3f}s {fast:>11.3f}s {unsorted:>9.3f}s {slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
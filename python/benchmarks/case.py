@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares the ASCII fast paths of bistr.lower(), upper(), and casefold() to the general ICU implementation.
+
+Usage: python benchmarks/case.py [LENGTHS...]
+"""
+
+from bistring import bistr
+from bistring._icu import _edit
+import icu
+import random
+import sys
+import timeit
+
+
+def main() -> None:
+    lengths = [int(arg) for arg in sys.argv[1:]] or [10, 100, 10000]
+
+    rng = random.Random(0)
+    alphabet = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,:/-_'
+
+    ops = {
+        'lower': (lambda bs: bs.lower(), lambda bs: _edit(bs, icu.CaseMap.toLower, None)),
+        'upper': (lambda bs: bs.upper(), lambda bs: _edit(bs, icu.CaseMap.toUpper, None)),
+        'casefold': (lambda bs: bs.casefold(), lambda bs: _edit(bs, icu.CaseMap.fold)),
+    }
+
+    print(f'{"op":>8} {"length":>7} {"icu":>10} {"ascii":>10} {"speedup":>8}')
+    for name, (fast, slow) in ops.items():
+        for length in lengths:
+            bs = bistr(''.join(rng.choice(alphabet) for _ in range(length)))
+            number = max(1, 100000 // length)
+            slow_time = min(timeit.repeat(lambda: slow(bs), number=number, repeat=3)) / number
+            fast_time = min(timeit.repeat(lambda: fast(bs), number=number, repeat=3)) / number
+            print(f'{name:>8} {length:>7} {slow_time * 1e6:>8.1f}us {fast_time * 1e6:>8.1f}us {slow_time / fast_time:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares the cost of constructing ICU objects to looking them up in bistring's shared pool, and measures the
+end-to-end cost of ICU-backed operations on short strings.
+
+Usage: python benchmarks/icu_setup.py [NUMBER]
+"""
+
+from bistring import bistr, WordTokenizer
+from bistring._icu import _get_break_iterator, _get_locale, _get_normalizer
+import icu
+import sys
+import timeit
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    locale = icu.Locale('en_US')
+    word = icu.BreakIterator.createWordInstance
+
+    setup = {
+        'Locale': (lambda: icu.Locale('en_US'), lambda: _get_locale('en_US')),
+        'Normalizer2': (icu.Normalizer2.getNFKDInstance, lambda: _get_normalizer('NFKD')),
+        'BreakIterator': (lambda: word(locale), lambda: _get_break_iterator(word, 'en_US')),
+    }
+
+    print(f'{"object":>26} {"create":>9} {"pooled":>9}')
+    for name, (create, pooled) in setup.items():
+        create_time = min(timeit.repeat(create, number=number, repeat=3)) / number
+        pooled_time = min(timeit.repeat(pooled, number=number, repeat=3)) / number
+        print(f'{name:>26} {create_time * 1e6:>7.2f}us {pooled_time * 1e6:>7.2f}us')
+
+    text = bistr('Héllo wörld')
+    tokenizer = WordTokenizer('en_US')
+    ops = {
+        "lower('en_US')": lambda: text.lower('en_US'),
+        "normalize('NFKD')": lambda: text.normalize('NFKD'),
+        'WordTokenizer.tokenize()': lambda: tokenizer.tokenize(text),
+        "WordTokenizer('en_US')": lambda: WordTokenizer('en_US'),
+    }
+
+    print()
+    print(f'{"operation":>26} {"time":>9}')
+    for name, op in ops.items():
+        time = min(timeit.repeat(op, number=number, repeat=3)) / number
+        print(f'{name:>26} {time * 1e6:>7.2f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares bistr.infer() with a cold and a warm InferCache to inferring without one.
+
+Usage: python benchmarks/infer_cache.py [LINES [LENGTH]]
+"""
+
+from bistring import InferCache, bistr
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    rng = random.Random(0)
+    pairs = []
+    for _ in range(lines):
+        original = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz  ,.') for _ in range(length))
+        modified = original.upper().replace(',', '').replace('  ', ' ')
+        pairs.append((original, modified))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = InferCache(os.path.join(tmp, 'alignments.db'))
+
+        for name, kwargs in [('uncached', {}), ('cold', {'cache': cache}), ('warm', {'cache': cache})]:
+            start = time.perf_counter()
+            for original, modified in pairs:
+                bistr.infer(original, modified, **kwargs)
+            elapsed = time.perf_counter() - start
+            print(f'{name:>10} {elapsed:>8.3f}s {1000 * elapsed / lines:>8.3f}ms/line')
+
+        print(f'{"db size":>10} {os.path.getsize(os.path.join(tmp, "alignments.db")) / 1024:>8.0f}KiB for {len(cache)} alignments')
+        cache.close()
+
+
+if __name__ == '__main__':
+    main()
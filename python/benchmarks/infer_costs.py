@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares the bit-parallel unit cost rows used by Hirschberg's algorithm to the cell-by-cell implementation.
+
+Usage: python benchmarks/infer_costs.py [LENGTH...]
+"""
+
+from bistring import Alignment
+import random
+import sys
+import timeit
+
+
+def main() -> None:
+    lengths = [int(arg) for arg in sys.argv[1:]] or [100, 300, 1000]
+
+    rng = random.Random(0)
+    unit = lambda a, b: int(a != b)
+
+    print(f'{"length":>8} {"cells":>12} {"bit-parallel":>14} {"speedup":>8}')
+    for length in lengths:
+        original = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(length))
+        modified = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(length))
+
+        # A custom cost function disables the bit-parallel implementation
+        cells = min(timeit.repeat(lambda: Alignment.infer(original, modified, unit, anchor=False), number=1, repeat=3))
+        bits = min(timeit.repeat(lambda: Alignment.infer(original, modified, method='hirschberg', anchor=False), number=1, repeat=3))
+
+        print(f'{length:>8} {cells:>11.3f}s {bits:>13.3f}s {cells / bits:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
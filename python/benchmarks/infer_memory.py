@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Measures the peak memory used by Hirschberg's algorithm on long sequences.
+
+Usage: python benchmarks/infer_memory.py [LENGTH]
+"""
+
+from bistring import Alignment
+import random
+import sys
+import time
+import tracemalloc
+
+
+def main() -> None:
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    rng = random.Random(0)
+    original = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(length))
+    modified = ''.join(c if rng.random() < 0.95 else 'X' for c in original)
+    unit = lambda a, b: int(a != b)
+
+    print(f'{"costs":>8} {"length":>8} {"time":>8} {"peak":>10} {"bytes/element":>14}')
+    for name, cost_fn in [('unit', None), ('custom', unit)]:
+        if cost_fn and length > 3000:
+            # Too slow without the bit-parallel rows
+            continue
+
+        # Warm up any lazy initialization, like importing NumPy
+        Alignment.infer(original[:10], modified[:10], cost_fn, method='hirschberg', anchor=False)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            Alignment.infer(original, modified, cost_fn, method='hirschberg', anchor=False)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        elapsed = time.perf_counter() - start
+
+        print(f'{name:>8} {length:>8} {elapsed:>7.2f}s {peak / 1e6:>8.2f}MB {peak / (2 * length):>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
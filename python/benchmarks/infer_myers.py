@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares the default inference for unit costs (Myers' algorithm, falling back to Hirschberg's for expensive
+subproblems) to pure Myers and pure Hirschberg, on similar and dissimilar sequences.
+
+Usage: python benchmarks/infer_myers.py [LENGTH]
+"""
+
+import bistring._alignment
+from bistring import Alignment
+import random
+import sys
+import timeit
+
+
+def main() -> None:
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    rng = random.Random(0)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz '
+
+    def text() -> str:
+        return ''.join(rng.choice(alphabet) for _ in range(length))
+
+    def edit(s: str, n: int) -> str:
+        chars = list(s)
+        for _ in range(n):
+            chars[rng.randrange(length)] = rng.choice(alphabet)
+        return ''.join(chars)
+
+    base = text()
+    cases = {
+        '1% edits': (base, edit(base, length // 100)),
+        '10% edits': (base, edit(base, length // 10)),
+        'unrelated': (base, text()),
+    }
+
+    limit = bistring._alignment._myers_limit
+    unbounded = lambda olength, mlength: length * 2
+
+    print(f'{"input":>10} {"default":>9} {"myers":>9} {"hirschberg":>11}')
+    for name, (original, modified) in cases.items():
+        default = min(timeit.repeat(lambda: Alignment.infer(original, modified), number=1, repeat=3))
+
+        bistring._alignment._myers_limit = unbounded
+        myers = min(timeit.repeat(lambda: Alignment.infer(original, modified), number=1, repeat=1))
+        bistring._alignment._myers_limit = limit
+
+        hirschberg = min(timeit.repeat(lambda: Alignment.infer(original, modified, method='hirschberg', anchor=False), number=1, repeat=3))
+
+        print(f'{name:>10} {default:>8.3f}s {myers:>8.3f}s {hirschberg:>10.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Measures bistr.normalize() throughput on text that is mostly, partly, or not at all normalized already.
+
+Usage: python benchmarks/normalize.py [FORMS...]
+"""
+
+from bistring import bistr
+import random
+import sys
+import timeit
+
+
+def main() -> None:
+    forms = sys.argv[1:] or ['NFC', 'NFKC', 'NFD', 'NFKD']
+
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randrange(2, 8))) for _ in range(10000)]
+    plain = ' '.join(rng.choice(words) for _ in range(20000))
+    texts = {
+        'ascii': plain,
+        'composed': plain.replace('e', '\u00E9').replace('o', '\u00F6'),
+        'decomposed': plain.replace('e', 'e\u0301').replace('o', 'o\u0308'),
+        'fancy': ''.join(chr(ord(c) - ord('a') + 0x1D586) if c.isalpha() else c for c in plain),
+    }
+
+    print(f'{"form":>6} ' + ' '.join(f'{name:>11}' for name in texts))
+    for form in forms:
+        times = []
+        for text in texts.values():
+            bs = bistr(text)
+            time = min(timeit.repeat(lambda: bs.normalize(form), number=1, repeat=3))
+            times.append(f'{len(text) / time / 1e6:>6.2f} MC/s')
+        print(f'{form:>6} ' + ' '.join(times))
+
+
+if __name__ == '__main__':
+    main()
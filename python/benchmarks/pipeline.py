@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares a Pipeline to the equivalent chain of bistr method calls.
+
+Usage: python benchmarks/pipeline.py [LENGTH...]
+"""
+
+from bistring import Pipeline, bistr
+from operator import methodcaller
+import random
+import sys
+import timeit
+
+
+STEPS = [
+    methodcaller('normalize', 'NFKD'),
+    bistr.casefold,
+    methodcaller('sub', r'[^\w\s]+', ''),
+    methodcaller('sub', r'\s+', ' '),
+    methodcaller('replace', 'the', 'THE'),
+    methodcaller('sub', r'\d+', '#'),
+    methodcaller('replace', 'fox', 'dog'),
+    methodcaller('sub', r'\b(\w)(\w*)\b', r'\2\1'),
+    bistr.strip,
+    bistr.upper,
+]
+
+
+def main() -> None:
+    lengths = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    rng = random.Random(0)
+    words = ['The', 'quick,', 'brown', 'fox', 'jumps', 'over', 'the', 'lazy', 'dog.', '42', 'ﬁne', 'Ǆemal', '\t', '  ']
+    pipeline = Pipeline(*STEPS)
+
+    print(f'{"length":>8} {"steps":>6} {"chained":>10} {"pipeline":>10} {"speedup":>8}')
+    for length in lengths:
+        text = bistr(' '.join(rng.choice(words) for _ in range(length // 5)))
+
+        def chained() -> bistr:
+            result = text
+            for step in STEPS:
+                result = step(result)
+            return result
+
+        assert pipeline(text) == chained()
+
+        slow = min(timeit.repeat(chained, number=1, repeat=3))
+        fast = min(timeit.repeat(lambda: pipeline(text), number=1, repeat=3))
+
+        print(f'{len(text):>8} {len(STEPS):>6} {slow:>9.3f}s {fast:>9.3f}s {slow / fast:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares bistr.replace_many() to repeated bistr.replace() calls for a dictionary of replacements.
+
+Usage: python benchmarks/replace_many.py [ENTRIES...]
+"""
+
+from bistring import Replacer, bistr
+import random
+import sys
+import timeit
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 50000]
+
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randrange(2, 8))) for _ in range(100000)]
+    text = bistr(' '.join(rng.choice(words) for _ in range(20000)))
+
+    print(f'{"entries":>8} {"replace":>10} {"compile":>10} {"replace_many":>13} {"speedup":>8}')
+    for size in sizes:
+        mapping = {word: word.upper() for word in rng.sample(words, size)}
+
+        # Repeated replace() is far too slow for large dictionaries, so extrapolate from a sample
+        sample = list(mapping.items())[:100]
+        slow = min(timeit.repeat(lambda: [text.replace(old, new) for old, new in sample], number=1, repeat=3))
+        slow *= len(mapping) / len(sample)
+
+        compile = min(timeit.repeat(lambda: Replacer(mapping), number=1, repeat=3))
+        replacer = Replacer(mapping)
+        fast = min(timeit.repeat(lambda: text.replace_many(replacer), number=1, repeat=3))
+
+        print(f'{size:>8} {slow:>9.3f}s {compile:>9.3f}s {fast:>12.3f}s {slow / fast:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares bistr.sub_all() to a sequence of bistr.sub() calls for a typical set of normalization rules.
+
+Usage: python benchmarks/sub_all.py [LENGTH...]
+"""
+
+from bistring import RewriteRules, bistr
+import random
+import sys
+import timeit
+
+
+RULES = [
+    (r'\s+', ' '),
+    (r'https?://\S+', '<URL>'),
+    (r'\S+@\S+\.\w+', '<EMAIL>'),
+    (r'\d+(?:\.\d+)?%', '<PERCENT>'),
+    (r'\$\d+(?:\.\d\d)?', '<MONEY>'),
+    (r'\d+', '<NUM>'),
+    (r'[“”]', '"'),
+    (r'[‘’]', "'"),
+    (r'…', '...'),
+    (r'[–—]', '-'),
+] + [(rf'\b{word}\b', word.upper()) for word in ['cannot', 'gonna', 'wanna', 'lol', 'omg', 'btw', 'imo', 'idk', 'tbh', 'irl', 'afaik', 'brb', 'fyi', 'asap', 'diy', 'eta', 'faq', 'nvm', 'ttyl', 'smh']]
+
+
+def main() -> None:
+    lengths = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    rng = random.Random(0)
+    words = ['the', 'quick', 'brown', 'fox', 'lol', 'btw', '42', '3.5%', '$9.99', 'http://example.com', 'a@b.com', '“hi”', '…', '—', '  ']
+    rules = RewriteRules(RULES)
+
+    print(f'{"length":>8} {"rules":>6} {"sub":>10} {"sub_all":>10} {"speedup":>8}')
+    for length in lengths:
+        text = bistr(' '.join(rng.choice(words) for _ in range(length // 4)))
+
+        def sequential() -> bistr:
+            result = text
+            for regex, repl in RULES:
+                result = result.sub(regex, repl)
+            return result
+
+        slow = min(timeit.repeat(sequential, number=1, repeat=3))
+        fast = min(timeit.repeat(lambda: text.sub_all(rules), number=1, repeat=3))
+
+        print(f'{len(text):>8} {len(RULES):>6} {slow:>9.3f}s {fast:>9.3f}s {slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Compares bistr.swapcase() and capitalize() to the previous character-by-character implementations.
+
+Usage: python benchmarks/swapcase.py [SIZES...]
+"""
+
+from bistring import BistrBuilder, bistr
+from itertools import islice
+import random
+import sys
+import timeit
+import unicodedata
+
+
+def old_capitalize(bs: bistr) -> bistr:
+    builder = BistrBuilder(bs)
+
+    title = bistr(bs.modified).title()
+    for chunk in islice(title.chunks(), 1):
+        builder.replace(len(chunk.original), chunk.modified)
+
+    lower = bistr(bs.modified).lower()
+    for chunk in islice(lower.chunks(), 1, None):
+        builder.replace(len(chunk.original), chunk.modified)
+
+    return builder.build()
+
+
+def old_swapcase(bs: bistr) -> bistr:
+    builder = BistrBuilder(bs)
+
+    lower = bistr(bs.modified).lower()
+    upper = bistr(bs.modified).upper()
+
+    while not builder.is_complete:
+        i = builder.position
+        cat = unicodedata.category(bs[i])
+        if cat == 'Ll':
+            repl = upper
+        elif cat == 'Lu':
+            repl = lower
+        else:
+            builder.skip(1)
+            continue
+
+        builder.append(repl[repl.alignment.modified_slice(i, i + 1)])
+
+    return builder.build()
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+
+    rng = random.Random(0)
+    words = ['Straße', 'ÉCOLE', 'café', 'Ὀδυσσεύς', 'ΑΘΗΝΑ', 'naïve', 'Hello', 'WORLD', 'the', '42']
+
+    print(f'{"op":>10} {"size":>8} {"before":>10} {"after":>10} {"speedup":>8}')
+    for size in sizes:
+        text = ''
+        while len(text) < size:
+            text += rng.choice(words) + ' '
+        bs = bistr(text[:size])
+
+        for name, old, new in [('swapcase', old_swapcase, bistr.swapcase), ('capitalize', old_capitalize, bistr.capitalize)]:
+            # The old implementations are too slow to repeat at the largest sizes
+            repeat = 3 if size <= 100_000 else 1
+            before = min(timeit.repeat(lambda: old(bs), number=1, repeat=repeat))
+            after = min(timeit.repeat(lambda: new(bs), number=1, repeat=repeat))
+            print(f'{name:>10} {size:>8} {before:>9.3f}s {after:>9.3f}s {before / after:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+"""
+Measures the effect of a TransformCache on a corpus with many duplicate lines.
+
+Usage: python benchmarks/transform_cache.py [DISTINCT_LINES [TOTAL_LINES]]
+"""
+
+from bistring import Pipeline, TransformCache, bistr
+from operator import methodcaller
+import random
+import sys
+import timeit
+
+
+def main() -> None:
+    distinct = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    rng = random.Random(0)
+    words = ['The', 'Quick', 'brown', 'ﬁx', 'JUMPS', 'över', 'the', 'Ǆemal', 'Straße', '①', 'ℌello']
+    lines = [' '.join(rng.choice(words) for _ in range(rng.randrange(3, 15))) for _ in range(distinct)]
+    # Skew the distribution so some lines are much more common than others, like boilerplate
+    corpus = [bistr(lines[min(int(rng.paretovariate(1)) - 1, distinct - 1)]) for _ in range(total)]
+
+    steps = [methodcaller('normalize', 'NFKC'), bistr.casefold]
+    uncached = Pipeline(*steps)
+
+    slow = min(timeit.repeat(lambda: [uncached(line) for line in corpus], number=1, repeat=3))
+
+    print(f'{"maxsize":>8} {"time":>8} {"speedup":>8} {"hits":>8} {"misses":>8} {"evictions":>10}')
+    print(f'{"-":>8} {slow:>7.3f}s {1:>7.1f}x')
+    for maxsize in [16, 256, 4096]:
+        cache = TransformCache(maxsize)
+        cached = Pipeline(*steps, cache=cache)
+        fast = timeit.timeit(lambda: [cached(line) for line in corpus], number=1)
+        info = cache.cache_info()
+        print(f'{maxsize:>8} {fast:>7.3f}s {slow / fast:>7.1f}x {info.hits:>8} {info.misses:>8} {info.evictions:>10}')
+
+
+if __name__ == '__main__':
+    main()
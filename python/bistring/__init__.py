@@ -4,4 +4,7 @@
 from ._alignment import *
 from ._bistr import *
 from ._builder import *
+from ._cache import *
+from ._pipeline import *
+from ._replace import *
 from ._token import *
@@ -5,16 +5,96 @@ from __future__ import annotations
 
 __all__ = ['Alignment']
 
+from array import array
 import bisect
-from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union, cast, overload
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate, chain
+import math
+from operator import sub
+from typing import Any, Callable, ClassVar, Dict, Generic, Hashable, Iterable, Iterator, List, Literal, MutableSequence, Optional, Sequence, Tuple, TypeVar, Union, cast, overload, TYPE_CHECKING
 
-from ._typing import AnyBounds, BiIndex, Bounds, Index, Range
+from ._numpy import import_numpy
+from ._typing import AnyBounds, BiIndex, Bounds, Index, ManyBounds, MaskedBounds, Range
 
 
 T = TypeVar('T')
 U = TypeVar('U')
 Real = Union[int, float]
 CostFn = Callable[[Optional[T], Optional[U]], Real]
+IntSeq = MutableSequence[int]
+Storage = Callable[[Iterable[int]], IntSeq]
+
+
+def _array(values: Iterable[int] = ()) -> IntSeq:
+    return array('q', values)
+
+
+_STORAGES: Dict[str, Storage] = {
+    'list': list,
+    'array': _array,
+}
+
+
+def _get_storage(name: Optional[str]) -> Storage:
+    if name is None:
+        name = Alignment.default_storage
+
+    storage = _STORAGES.get(name)
+    if storage:
+        return storage
+    else:
+        raise ValueError(f'invalid alignment storage {name!r}')
+
+
+class _Runs:
+    """
+    Accumulates aligned positions into maximal diagonal runs, skipping duplicate positions and merging runs that
+    continue each other.  Positions must already be in order.
+    """
+
+    __slots__ = ('original', 'modified', 'lengths')
+
+    def __init__(self, storage: Storage):
+        self.original = storage(())
+        self.modified = storage(())
+        self.lengths = storage(())
+
+    def append(self, o: int, m: int) -> None:
+        """
+        Append a single pair of aligned positions.
+        """
+        if self.lengths:
+            n = self.lengths[-1]
+            last_o = self.original[-1] + n
+            last_m = self.modified[-1] + n
+            if o == last_o + 1 and m == last_m + 1:
+                self.lengths[-1] = n + 1
+                return
+            elif o == last_o and m == last_m:
+                return
+
+        self.original.append(o)
+        self.modified.append(m)
+        self.lengths.append(0)
+
+    def append_run(self, o: int, m: int, n: int) -> None:
+        """
+        Append the pairs ``(o, m), (o + 1, m + 1), ..., (o + n, m + n)``.
+        """
+        self.append(o, m)
+        self.lengths[-1] += n
+
+    def copy(self) -> _Runs:
+        result = _Runs.__new__(_Runs)
+        result.original = self.original[:]
+        result.modified = self.modified[:]
+        result.lengths = self.lengths[:]
+        return result
+
+    def last(self) -> BiIndex:
+        n = self.lengths[-1]
+        return self.original[-1] + n, self.modified[-1] + n
 
 
 class Alignment:
@@ -70,55 +150,174 @@ class Alignment:
 
         >>> a.original_bounds(0, 2)
         (0, 2)
+
+    By default, the aligned indices are stored in plain Python lists.  Alignments with a compact storage backend can be
+    created by passing ``storage='array'``, which stores the indices in machine integer arrays and uses far less memory
+    for large alignments:
+
+        >>> a = Alignment.identity(5, storage='array')
+        >>> a.storage
+        'array'
+        >>> a == Alignment.identity(5)
+        True
+
+    Alignments derived from another one (by slicing, shifting, composing, etc.) keep the storage of the alignment they
+    were derived from.
+
+    Internally, alignments are stored as maximal runs of positions that both advance by one at a time, so memory use and
+    the cost of most operations scale with the number of edits rather than the length of the sequences.  Repeated pairs
+    carry no information, so they are never stored, whether they're passed to the constructor or produced by an
+    operation like :meth:`compose` or :meth:`slice_by_original`:
+
+        >>> list(Alignment([(0, 0), (2, 0)]).slice_by_original(1, 1))
+        [(1, 0)]
+    """
+
+    __slots__ = ('_original', '_modified', '_lengths', '_offsets')
+
+    default_storage: ClassVar[str] = 'list'
+    """
+    The storage backend used when none is specified explicitly, either ``'list'`` or ``'array'``.  Set this to
+    ``'array'`` to make compact alignments the default globally.
+    """
+
+    _original: IntSeq
+    """
+    The original position at the start of each run.
     """
 
-    __slots__ = ('_original', '_modified')
+    _modified: IntSeq
+    """
+    The modified position at the start of each run.
+    """
+
+    _lengths: IntSeq
+    """
+    The number of diagonal steps in each run, i.e. one less than the number of aligned pairs it holds.
+    """
 
-    _original: List[int]
-    _modified: List[int]
+    _offsets: Optional[IntSeq]
+    """
+    The index of the first pair of each run, plus the total number of pairs (computed lazily).
+    """
 
-    def __init__(self, values: Iterable[BiIndex]):
+    def __init__(self, values: Iterable[BiIndex], storage: Optional[str] = None):
         """
         :param values:
             The sequence of aligned indices.  Each element should be a tuple ``(x, y)``, where `x` is the original
-            sequence position and `y` is the modified sequence position.
+            sequence position and `y` is the modified sequence position.  Consecutive duplicates are dropped.
+        :param storage:
+            The storage backend to use, either ``'list'`` or ``'array'``.  Defaults to :attr:`default_storage`.
         """
 
-        self._original = []
-        self._modified = []
+        runs = _Runs(_get_storage(storage))
         for i, j in values:
-            if self._original:
-                if i < self._original[-1]:
+            if runs.lengths:
+                last_i, last_j = runs.last()
+                if i < last_i:
                     raise ValueError('Original sequence position moved backwards')
-                elif j < self._modified[-1]:
+                elif j < last_j:
                     raise ValueError('Modified sequence position moved backwards')
-                elif i == self._original[-1] and j == self._modified[-1]:
-                    continue
 
-            self._original.append(i)
-            self._modified.append(j)
+            runs.append(i, j)
 
-        if not self._original:
+        if not runs.lengths:
             raise ValueError('No sequence positions to align')
 
+        self._original = runs.original
+        self._modified = runs.modified
+        self._lengths = runs.lengths
+        self._offsets = None
+
     @classmethod
-    def _create(cls, original: List[int], modified: List[int]) -> Alignment:
+    def _create(cls, original: IntSeq, modified: IntSeq, lengths: IntSeq) -> Alignment:
         result: Alignment = super().__new__(cls)
         result._original = original
         result._modified = modified
+        result._lengths = lengths
+        result._offsets = None
         return result
 
+    @classmethod
+    def _from_runs(cls, runs: _Runs) -> Alignment:
+        return cls._create(runs.original, runs.modified, runs.lengths)
+
+    def _storage(self) -> Storage:
+        if isinstance(self._original, array):
+            return _array
+        else:
+            return list
+
+    @property
+    def storage(self) -> str:
+        """
+        The name of the storage backend holding this alignment's indices, either ``'list'`` or ``'array'``.
+        """
+        if isinstance(self._original, array):
+            return 'array'
+        else:
+            return 'list'
+
+    def _runs(self, first: BiIndex, last: BiIndex) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterate over the runs between two positions, given as ``(run, step)`` pairs, as ``(o, m, n)`` triples.
+        """
+
+        s, k = first
+        t, l = last
+        original, modified, lengths = self._original, self._modified, self._lengths
+
+        if s == t:
+            yield original[s] + k, modified[s] + k, l - k
+            return
+
+        yield original[s] + k, modified[s] + k, lengths[s] - k
+        for i in range(s + 1, t):
+            yield original[i], modified[i], lengths[i]
+        yield original[t], modified[t], l
+
+    def _last(self) -> BiIndex:
+        s = len(self._lengths) - 1
+        return s, self._lengths[s]
+
+    def _get_offsets(self) -> IntSeq:
+        offsets = self._offsets
+        if offsets is None:
+            offsets = self._storage()(())
+            total = 0
+            for n in self._lengths:
+                offsets.append(total)
+                total += n + 1
+            offsets.append(total)
+            self._offsets = offsets
+        return offsets
+
+    def _locate(self, index: int) -> BiIndex:
+        """
+        Find the ``(run, step)`` position of the pair with the given index.
+        """
+        offsets = self._get_offsets()
+        s = bisect.bisect_right(offsets, index) - 1
+        return s, index - offsets[s]
+
+    def _is_identity(self) -> bool:
+        """
+        Check whether this alignment maps every position to itself, in constant time.
+        """
+        return len(self._lengths) == 1 and self._original[0] == self._modified[0]
+
     def __str__(self) -> str:
-        i, j = self._original[0], self._original[-1]
-        k, l = self._modified[0], self._modified[-1]
-        if self._original == list(range(i, j + 1)) and self._modified == list(range(k, l + 1)):
-            return f'[{i}:{j}⇋{k}:{l}]'
+        if len(self._lengths) == 1:
+            i, k = self._original[0], self._modified[0]
+            n = self._lengths[0]
+            return f'[{i}:{i + n}⇋{k}:{k + n}]'
         else:
             return '[' + ', '.join(f'{i}⇋{j}' for i, j in self) + ']'
 
     def __repr__(self) -> str:
-        i, j = self._original[0], self._original[-1]
-        if self._original == list(range(i, j + 1)) and self._modified == list(range(i, j + 1)):
+        if self._is_identity():
+            i = self._original[0]
+            j = i + self._lengths[0]
             if i == 0:
                 return f'Alignment.identity({j})'
             else:
@@ -128,7 +327,12 @@ class Alignment:
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Alignment):
-            return (self._original, self._modified) == (other._original, other._modified)
+            mine = (self._original, self._modified, self._lengths)
+            theirs = (other._original, other._modified, other._lengths)
+            if type(self._original) is type(other._original):
+                return mine == theirs
+            else:
+                return tuple(map(list, mine)) == tuple(map(list, theirs))
         else:
             return NotImplemented
 
@@ -163,18 +367,18 @@ class Alignment:
 
     @overload
     @classmethod
-    def identity(cls, __length: int) -> Alignment: ...
+    def identity(cls, __length: int, *, storage: Optional[str] = None) -> Alignment: ...
 
     @overload
     @classmethod
-    def identity(cls, __start: int, __stop: int) -> Alignment: ...
+    def identity(cls, __start: int, __stop: int, *, storage: Optional[str] = None) -> Alignment: ...
 
     @overload
     @classmethod
-    def identity(cls, __bounds: Range) -> Alignment: ...
+    def identity(cls, __bounds: Range, *, storage: Optional[str] = None) -> Alignment: ...
 
     @classmethod
-    def identity(cls, *args: Union[int, range, slice, Bounds]) -> Alignment:
+    def identity(cls, *args: Union[int, range, slice, Bounds], storage: Optional[str] = None) -> Alignment:
         """
         Create an identity alignment, which maps all intervals to themselves.  You can pass the size of the sequence:
 
@@ -193,32 +397,44 @@ class Alignment:
         """
 
         start, stop = cls._parse_bounds(args)
-        values = list(range(start, stop + 1))
-        return cls._create(values, values)
+        factory = _get_storage(storage)
+        return cls._create(factory([start]), factory([start]), factory([stop - start]))
 
     @classmethod
-    def _infer_costs(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U]) -> List[Real]:
+    def _infer_costs(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], orange: range, mrange: range) -> List[Real]:
         """
         The Needleman–Wunsch or Wagner–Fischer algorithm.  Here we use it in a way that only computes the final row of
         costs, without finding the alignment itself.  Hirschberg's algorithm uses it as a subroutine to find the optimal
         alignment in less than O(N*M) space.
 
+        Only the elements at the indices in `orange` and `mrange` are aligned, which may run backwards, to avoid copying
+        the sequences.
+
         https://en.wikipedia.org/wiki/Needleman%E2%80%93Wunsch_algorithm
         https://en.wikipedia.org/wiki/Wagner%E2%80%93Fischer_algorithm
         """
 
+        if cost_fn is _unit_cost:
+            try:
+                return cls._infer_costs_unit(original, modified, orange, mrange)
+            except TypeError:
+                # Unhashable elements
+                pass
+        elif isinstance(cost_fn, _CostTable):
+            return cost_fn.costs(original[_as_slice(orange)], modified[_as_slice(mrange)])
+
         row: List[Real] = [0]
-        for i, m in enumerate(modified):
+        for i, m in enumerate(map(modified.__getitem__, mrange)):
             cost = row[i] + cost_fn(None, m)
             row.append(cost)
 
         prev: List[Real] = [0] * len(row)
 
-        for o in original:
+        for o in map(original.__getitem__, orange):
             prev, row = row, prev
             row[0] = prev[0] + cost_fn(o, None)
 
-            for i, m in enumerate(modified):
+            for i, m in enumerate(map(modified.__getitem__, mrange)):
                 sub_cost = prev[i] + cost_fn(o, m)
                 del_cost = prev[i + 1] + cost_fn(o, None)
                 ins_cost = row[i] + cost_fn(None, m)
@@ -227,24 +443,64 @@ class Alignment:
         return row
 
     @classmethod
-    def _infer_matrix(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U]) -> List[Bounds]:
+    def _infer_costs_unit(cls, original: Sequence[T], modified: Sequence[U], orange: range, mrange: range) -> List[Real]:
+        """
+        Like :meth:`_infer_costs`, but for unit costs only.  Myers' bit-vector algorithm, in Hyyrö's formulation for
+        global edit distance, computes each row from the last using a few operations on integers with one bit per
+        element of `modified`, encoding whether the costs increase or decrease along the row.
+
+        https://doi.org/10.1145/316542.316550
+        """
+
+        # The positions where each element occurs in `modified`
+        peq: Dict[Any, int] = {}
+        for j, m in enumerate(map(modified.__getitem__, mrange)):
+            peq[m] = peq.get(m, 0) | (1 << j)
+
+        length = len(mrange)
+        if length == 0:
+            return [len(orange)]
+        mask = (1 << length) - 1
+
+        # Positive and negative vertical deltas, starting from the row 0, 1, 2, ...
+        pv = mask
+        mv = 0
+
+        for o in map(original.__getitem__, orange):
+            eq = peq.get(o, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            # The cost of the first column always increases by one
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+
+        pbits = map(int, reversed(f'{pv:0{length}b}'))
+        mbits = map(int, reversed(f'{mv:0{length}b}'))
+        return list(accumulate(map(sub, pbits, mbits), initial=len(orange)))
+
+    @classmethod
+    def _infer_matrix(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], orange: range, mrange: range) -> List[BiIndex]:
         """
         The Needleman–Wunsch or Wagner–Fischer algorithm, using the entire matrix to compute the optimal alignment.
         """
 
         row: List[Tuple[Real, int, int]] = [(0, -1, -1)]
-        for j, m in enumerate(modified):
+        for j, m in enumerate(map(modified.__getitem__, mrange)):
             cost = row[j][0] + cost_fn(None, m)
             row.append((cost, 0, j))
 
         matrix = [row]
 
-        for i, o in enumerate(original):
+        for i, o in enumerate(map(original.__getitem__, orange)):
             prev = matrix[i]
             cost = prev[0][0] + cost_fn(o, None)
             row = [(cost, i, 0)]
 
-            for j, m in enumerate(modified):
+            for j, m in enumerate(map(modified.__getitem__, mrange)):
                 cost = prev[j][0] + cost_fn(o, m)
                 x, y = i, j
 
@@ -266,44 +522,322 @@ class Alignment:
         i = len(matrix) - 1
         j = len(matrix[i]) - 1
         while i >= 0:
-            result.append((i, j))
+            result.append((orange.start + i, mrange.start + j))
             _, i, j = matrix[i][j]
 
         result.reverse()
         return result
 
     @classmethod
-    def _infer_recursive(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U]) -> List[BiIndex]:
+    def _infer_costs_banded(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], orange: range, mrange: range, band: Bounds) -> List[Real]:
+        """
+        Like :meth:`_infer_costs`, but only computes the cells ``(i, j)`` of the matrix with ``dmin <= i - j <= dmax``.
+        Cells outside the band are treated as having infinite cost.  This is Ukkonen's optimization for edit distances
+        that are known to be small.
+
+        https://doi.org/10.1016/S0019-9958(85)80046-2
+        """
+
+        dmin, dmax = band
+        length = len(mrange)
+
+        row: List[Real] = [math.inf] * (length + 1)
+        row[0] = 0
+        for j in range(min(length, -dmin)):
+            row[j + 1] = row[j] + cost_fn(None, modified[mrange[j]])
+
+        prev: List[Real] = [math.inf] * len(row)
+
+        for i, o in enumerate(map(original.__getitem__, orange), 1):
+            prev, row = row, prev
+
+            lo = max(0, i - dmax)
+            hi = min(length, i - dmin)
+
+            # The band moves right by one cell per row, so clear the stale cells from two rows ago
+            for j in range(max(0, lo - 2), min(lo, length + 1)):
+                row[j] = math.inf
+
+            if lo == 0:
+                row[0] = prev[0] + cost_fn(o, None)
+
+            for j in range(max(lo, 1), hi + 1):
+                m = modified[mrange[j - 1]]
+                sub_cost = prev[j - 1] + cost_fn(o, m)
+                del_cost = prev[j] + cost_fn(o, None)
+                ins_cost = row[j - 1] + cost_fn(None, m)
+                row[j] = min(sub_cost, del_cost, ins_cost)
+
+        return row
+
+    @classmethod
+    def _infer_band(cls, olength: int, mlength: int, budget: Real, min_indel: Real) -> Optional[Bounds]:
+        """
+        Compute the diagonal band that contains every alignment path costing at most `budget`.  A path through ``(i,
+        j)`` needs at least ``abs(i - j) + abs(delta - (i - j))`` insertions and deletions, where ``delta = olength -
+        mlength``.
+
+        :returns:
+            The ``(dmin, dmax)`` band, or ``None`` if no path is that cheap.
+        """
+
+        delta = olength - mlength
+        width = int(budget // min_indel)
+        if width < abs(delta):
+            return None
+
+        extra = (width - abs(delta)) // 2
+        return min(0, delta) - extra, max(0, delta) + extra
+
+    @classmethod
+    def _infer_recursive(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], runs: _Runs, olo: int, ohi: int, mlo: int, mhi: int, budget: Optional[Real] = None, min_indel: Real = 0) -> bool:
         """
         Hirschberg's algorithm for computing optimal alignments in linear space.
 
         https://en.wikipedia.org/wiki/Hirschberg's_algorithm
+
+        Aligns ``original[olo:ohi]`` with ``modified[mlo:mhi]``, appending the result to `runs`.  The subproblems are
+        passed around as index ranges rather than slices, so no part of the sequences is ever copied.
+
+        If a `budget` is given, the cost rows are restricted to the band of cells that can lie on an alignment that
+        costs at most that much, and ``False`` is returned if the optimal alignment costs more than the budget.  The
+        optimal alignment is otherwise the same as without a budget, since every optimal path lies inside the band.
         """
 
-        if len(original) <= 1 or len(modified) <= 1:
-            return cls._infer_matrix(original, modified, cost_fn)
+        if ohi - olo <= 1 or mhi - mlo <= 1:
+            for o, m in cls._infer_matrix(original, modified, cost_fn, range(olo, ohi), range(mlo, mhi)):
+                runs.append(o, m)
+            return True
+
+        omid = (olo + ohi) // 2
+        oleft = range(olo, omid)
+        oright = range(ohi - 1, omid - 1, -1)
+        mleft = range(mlo, mhi)
+        mright = range(mhi - 1, mlo - 1, -1)
+
+        if budget is None:
+            lcosts = cls._infer_costs(original, modified, cost_fn, oleft, mleft)
+            rcosts = cls._infer_costs(original, modified, cost_fn, oright, mright)[::-1]
+        else:
+            # The band is symmetric, so it's the same for the reversed sequences
+            band = cls._infer_band(ohi - olo, mhi - mlo, budget, min_indel)
+            if band is None:
+                return False
+            lcosts = cls._infer_costs_banded(original, modified, cost_fn, oleft, mleft, band)
+            rcosts = cls._infer_costs_banded(original, modified, cost_fn, oright, mright, band)[::-1]
+
+        split = min(range(len(lcosts)), key=lambda i: lcosts[i] + rcosts[i])
+        mmid = mlo + split
+
+        lbudget = rbudget = None
+        if budget is not None:
+            if lcosts[split] + rcosts[split] > budget:
+                return False
+            # The halves of the optimal alignment cost exactly this much, so use that to narrow their bands
+            lbudget, rbudget = lcosts[split], rcosts[split]
+            if not isinstance(lbudget, int) or not isinstance(rbudget, int):
+                # Rounding errors could make either half cost slightly more than this, so don't narrow their bands
+                lbudget = rbudget = budget
+
+        return (cls._infer_recursive(original, modified, cost_fn, runs, olo, omid, mlo, mmid, lbudget, min_indel)
+                and cls._infer_recursive(original, modified, cost_fn, runs, omid, ohi, mmid, mhi, rbudget, min_indel))
 
-        omid = len(original) // 2
-        oleft = original[:omid]
-        oright = original[omid:]
+    @classmethod
+    def _infer_banded(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], max_distance: Real) -> Alignment:
+        """
+        Hirschberg's algorithm restricted to a diagonal band, which is doubled in size until it contains the optimal
+        alignment.
+        """
 
-        lcosts = cls._infer_costs(oleft, modified, cost_fn)
-        rcosts = cls._infer_costs(oright[::-1], modified[::-1], cost_fn)[::-1]
+        costs = chain((cost_fn(o, None) for o in original), (cost_fn(None, m) for m in modified))
+        min_indel = min(costs, default=0)
 
-        mmid = min(range(len(lcosts)), key=lambda i: lcosts[i] + rcosts[i])
-        mleft = modified[:mmid]
-        mright = modified[mmid:]
+        if min_indel > 0:
+            budget = max(max_distance, min_indel)
+            while True:
+                runs = _Runs(_get_storage(None))
+                if cls._infer_recursive(original, modified, cost_fn, runs, 0, len(original), 0, len(modified), budget, min_indel):
+                    return cls._from_runs(runs)
+                budget *= 2
 
-        left = cls._infer_recursive(oleft, mleft, cost_fn)
-        right = cls._infer_recursive(oright, mright, cost_fn)
-        for (o, m) in right:
-            left.append((o + omid, m + mmid))
-        return left
+        # Free insertions or deletions make the band unbounded
+        return cls._infer(original, modified, cost_fn, None)
 
     @classmethod
-    def infer(cls, original: Sequence[T], modified: Sequence[U], cost_fn: Optional[CostFn[T, U]] = None) -> Alignment:
+    def _infer_parallel(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], executor: Executor) -> Alignment:
+        """
+        Hirschberg's algorithm, with independent work done in parallel.  Subproblems of at least ``_PARALLEL_CELLS``
+        cells are split one level at a time, computing their forward and backward cost rows concurrently.  Smaller
+        subproblems are solved sequentially, each by a single task.  The splits are the same as :meth:`_infer_recursive`
+        would choose, so the result is too.
         """
-        Infer the alignment between two sequences with the lowest edit distance.
+
+        Task = Tuple[Tuple[int, int, int, int], Future[Any], Optional[Future[Any]]]
+
+        def submit(olo: int, ohi: int, mlo: int, mhi: int) -> Task:
+            bounds = (olo, ohi, mlo, mhi)
+            oslice = original[olo:ohi]
+            mslice = modified[mlo:mhi]
+            olen = ohi - olo
+            mlen = mhi - mlo
+
+            if olen <= 1 or mlen <= 1 or olen * mlen < _PARALLEL_CELLS:
+                return bounds, executor.submit(cls._infer, oslice, mslice, cost_fn, None), None
+
+            omid = olen // 2
+            lfuture = executor.submit(cls._infer_costs, oslice, mslice, cost_fn, range(omid), range(mlen))
+            rfuture = executor.submit(cls._infer_costs, oslice, mslice, cost_fn, range(olen - 1, omid - 1, -1), range(mlen - 1, -1, -1))
+            return bounds, lfuture, rfuture
+
+        tasks = [submit(0, len(original), 0, len(modified))]
+        while any(rfuture for _, _, rfuture in tasks):
+            next_tasks = []
+            for task in tasks:
+                (olo, ohi, mlo, mhi), lfuture, rfuture = task
+                if rfuture is None:
+                    next_tasks.append(task)
+                    continue
+
+                lcosts = lfuture.result()
+                rcosts = rfuture.result()[::-1]
+                split = min(range(len(lcosts)), key=lambda i: lcosts[i] + rcosts[i])
+
+                omid = (olo + ohi) // 2
+                mmid = mlo + split
+                next_tasks.append(submit(olo, omid, mlo, mmid))
+                next_tasks.append(submit(omid, ohi, mmid, mhi))
+            tasks = next_tasks
+
+        runs = _Runs(_get_storage(None))
+        for (olo, _, mlo, _), future, _ in tasks:
+            part = future.result()
+            for o, m, n in zip(part._original, part._modified, part._lengths):
+                runs.append_run(o + olo, m + mlo, n)
+        return cls._from_runs(runs)
+
+    @classmethod
+    def _infer_myers(cls, original: Sequence[T], modified: Sequence[U]) -> Alignment:
+        """
+        Myers' O((N+M)D) diff algorithm, generalized to unit-cost edit distance with substitutions as in Ukkonen's
+        diagonal transition method.  The linear space refinement recursively splits the problem at a "middle snake"
+        found by searching forwards and backwards at the same time.
+
+        http://www.xmailserver.org/diff2.pdf
+        https://doi.org/10.1016/S0019-9958(85)80046-2
+        """
+
+        runs = _Runs(_get_storage(None))
+        snake = _Snake(original, modified)
+
+        # Myers' algorithm is slow for dissimilar sequences, so subproblems that turn out to be too expensive are
+        # solved with Hirschberg's algorithm instead, which uses bit-parallel rows for hashable elements (checked
+        # lazily, since many inputs never need a middle snake)
+        bounded: Optional[bool] = None
+
+        # An explicit stack instead of recursion; entries are (olo, ohi, mlo, mhi) subproblems to solve, or
+        # (o, m, n) runs to emit once everything before them is done
+        stack: List[Tuple[int, ...]] = [(0, len(original), 0, len(modified))]
+        while stack:
+            task = stack.pop()
+            if len(task) == 3:
+                runs.append_run(*task)
+                continue
+
+            olo, ohi, mlo, mhi = task
+
+            prefix = snake.forward(olo, ohi, mlo, mhi)
+            runs.append_run(olo, mlo, prefix)
+            olo += prefix
+            mlo += prefix
+
+            suffix = snake.backward(olo, ohi, mlo, mhi)
+            ohi -= suffix
+            mhi -= suffix
+            stack.append((ohi, mhi, suffix))
+
+            if olo == ohi:
+                for m in range(mlo + 1, mhi + 1):
+                    runs.append(olo, m)
+            elif mlo == mhi:
+                for o in range(olo + 1, ohi + 1):
+                    runs.append(o, mlo)
+            elif ohi - olo == 1 and mhi - mlo == 1:
+                runs.append(ohi, mhi)
+            else:
+                if bounded is None:
+                    bounded = _hashable(original) and _hashable(modified)
+                max_d = _myers_limit(ohi - olo, mhi - mlo) if bounded else None
+                point = cls._infer_middle_snake(snake, olo, ohi, mlo, mhi, max_d)
+                if point is None:
+                    cls._infer_recursive(original, modified, _unit_cost, runs, olo, ohi, mlo, mhi)
+                else:
+                    o, m = point
+                    stack.append((o, ohi, m, mhi))
+                    stack.append((olo, o, mlo, m))
+
+        return cls._from_runs(runs)
+
+    @classmethod
+    def _infer_middle_snake(cls, snake: _Snake[T, U], olo: int, ohi: int, mlo: int, mhi: int, max_d: Optional[int] = None) -> Optional[BiIndex]:
+        """
+        Find a point on an optimal alignment path that splits its cost in half, or ``None`` if the searches have to go
+        further than `max_d` to meet.
+
+        Diagonals are numbered by ``k = o - m``, relative to ``(olo, mlo)``.  ``forward[k]`` is the furthest position
+        ``o`` on diagonal `k` that is reachable from the start with cost `d`, and ``backward[k]`` is the earliest
+        position ``o`` on diagonal `k` from which the end is reachable with cost `d`.  Costs are non-decreasing along
+        each diagonal, so once the two searches overlap on some diagonal, the point reached by the forward search lies
+        on an optimal path.
+        """
+
+        n = ohi - olo
+        m = mhi - mlo
+        delta = n - m
+
+        forward = {0: snake.forward(olo, ohi, mlo, mhi)}
+        backward = {delta: n - snake.backward(olo, ohi, mlo, mhi)}
+
+        d = 0
+        while True:
+            d += 1
+            if max_d is not None and d > max_d:
+                return None
+
+            prev = forward
+            forward = {}
+            for k in range(max(-d, -m), min(d, n) + 1):
+                # Substitution, deletion, and insertion, respectively
+                x = max(prev.get(k, -1) + 1, prev.get(k - 1, -1) + 1, prev.get(k + 1, -1))
+                x = min(x, n, m + k)
+                if x < max(0, k):
+                    continue
+                x += snake.forward(olo + x, ohi, mlo + x - k, mhi)
+                forward[k] = x
+
+                y = backward.get(k)
+                if y is not None and x >= y:
+                    return olo + x, mlo + x - k
+
+            prev = backward
+            backward = {}
+            inf = n + 1
+            for k in range(max(delta - d, -m), min(delta + d, n) + 1):
+                # Substitution, deletion, and insertion, respectively
+                x = min(prev.get(k, inf) - 1, prev.get(k + 1, inf) - 1, prev.get(k - 1, inf))
+                x = max(x, 0, k)
+                if x > min(n, m + k):
+                    continue
+                x -= snake.backward(olo, olo + x, mlo, mlo + x - k)
+                backward[k] = x
+
+                y = forward.get(k)
+                if y is not None and y >= x:
+                    return olo + y, mlo + y - k
+
+    @classmethod
+    def infer(cls, original: Sequence[T], modified: Sequence[U], cost_fn: Optional[CostFn[T, U]] = None, *, max_distance: Optional[Real] = None, method: Optional[str] = None, anchor: bool = False, workers: Optional[int] = None, executor: Optional[Executor] = None, cache: Optional[InferCache] = None, cache_key: Optional[str] = None) -> Alignment:
+        """
+        Infer the alignment between two sequences with the lowest edit distance (unless `anchor` is passed).
 
             >>> Alignment.infer('color', 'color')
             Alignment.identity(5)
@@ -312,8 +846,14 @@ class Alignment:
             >>> a.original_bounds(3, 5)
             (3, 4)
 
-        Warning: this operation has time complexity ``O(N*M)``, where `N` and `M` are the lengths of the original and
-        modified sequences, and so should only be used for relatively short sequences.
+        Warning: with a custom `cost_fn`, this operation has time complexity ``O(N*M)``, where `N` and `M` are the
+        lengths of the original and modified sequences, and so should only be used for relatively short sequences.  If
+        the sequences are known to be similar, passing `max_distance` reduces it to about ``O(max_distance*N)``.
+        Otherwise, with the default costs, Myers' algorithm is used instead, which takes ``O((N+M)*D)`` time for an edit
+        distance `D`, switching to a bit-parallel form of Hirschberg's algorithm for any part of the sequences that is
+        too dissimilar.
+        If NumPy is installed, integer-valued cost functions are evaluated once per pair of distinct elements and the
+        rows of the dynamic programming matrix are computed with array operations, which is much faster.
 
         :param original:
             The original sequence.
@@ -324,28 +864,258 @@ class Alignment:
             with `b`.  ``cost_fn(a, None)`` returns the cost of deleting `a`, and ``cost_fn(None, b)`` returns the cost
             of inserting `b`.  By default, all operations have cost 1 except replacing identical elements, which has
             cost 0.
+        :param max_distance:
+            An estimate of the cost of the optimal alignment.  If given, only alignments within a diagonal band that
+            could cost that much are considered, and the band is widened automatically if the optimal alignment turns
+            out to be more expensive.  The result is the same as without the band, as long as all costs are
+            non-negative.  Only Hirschberg's algorithm supports a band, so it is the default when this is given, and
+            passing it with ``method='myers'`` raises a :class:`ValueError`.
+        :param method:
+            The algorithm to use: ``'myers'``, which only supports the default costs, or ``'hirschberg'``, which
+            supports any `cost_fn`.  By default, Myers' algorithm is chosen unless `cost_fn` or `max_distance` is
+            given.  Both find an alignment with the lowest cost, but may choose different ones when there are ties.
+        :param anchor:
+            Whether to speed up Hirschberg's algorithm by aligning common prefixes and suffixes, as well as blocks that
+            occur exactly once in both sequences, before inferring the rest.  This is much faster for long sequences
+            with local edits, but makes the result a heuristic: it may not have the lowest cost, especially when blocks
+            of the sequences have been moved around.
+        :param workers:
+            If given, Hirschberg's algorithm is run in parallel in a pool of this many processes.  Large subproblems are
+            split in parallel, and small ones are solved in parallel; the result is the same as running sequentially.
+            The elements and `cost_fn` must be picklable.  Only Hirschberg's algorithm without `max_distance` runs in
+            parallel, so this is ignored by Myers' algorithm, by the banded algorithm, and for sequences too short to be
+            worth starting a pool for.
+        :param executor:
+            Like `workers`, but uses an existing :class:`concurrent.futures.Executor` instead of starting a new pool.
+            Ignored in the same cases as `workers`.
+        :param cache:
+            An :class:`InferCache` to look up the alignment in, and store it in if it's missing.
+        :param cache_key:
+            A string identifying `cost_fn` in the `cache`, in place of its qualified name.  Required to cache
+            alignments for lambdas, bound methods, and :func:`functools.partial` objects, whose names don't determine
+            their costs.
         :returns:
             The inferred alignment.
         """
 
+        if cache is not None:
+            return cache._infer(
+                'Alignment.infer', original, modified, cost_fn, cache_key, (max_distance, method, anchor),
+                lambda: cls.infer(original, modified, cost_fn, max_distance=max_distance, method=method, anchor=anchor, workers=workers, executor=executor),
+            )
+
+        if workers is not None and executor is not None:
+            raise ValueError('Pass either workers or executor, not both')
+
+        if method is None:
+            method = 'hirschberg' if cost_fn or max_distance is not None else 'myers'
+
+        # Only pay for starting a pool if there's something to split up
+        if workers is not None and method == 'hirschberg' and max_distance is None and len(original) * len(modified) >= _PARALLEL_CELLS:
+            with ProcessPoolExecutor(workers) as pool:
+                return cls.infer(original, modified, cost_fn, max_distance=max_distance, method=method, anchor=anchor, executor=pool)
+
+        if method == 'myers':
+            if cost_fn:
+                raise ValueError('Myers\' algorithm only supports the default cost function')
+            if max_distance is not None:
+                raise ValueError('Myers\' algorithm doesn\'t support max_distance')
+            return cls._infer_myers(original, modified)
+        elif method != 'hirschberg':
+            raise ValueError(f'invalid inference method {method!r}')
+
         if cost_fn is None:
-            real_cost_fn: CostFn[T, U] = lambda a, b: int(a != b)
+            real_cost_fn: CostFn[T, U] = _unit_cost
         else:
             real_cost_fn = cost_fn
 
+        if anchor:
+            return cls._infer_anchored(original, modified, real_cost_fn, max_distance, executor)
+        else:
+            return cls._infer_exact(original, modified, real_cost_fn, max_distance, executor)
+
+    @classmethod
+    def _infer_exact(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], max_distance: Optional[Real], executor: Optional[Executor] = None) -> Alignment:
+        if max_distance is None and cost_fn is not _unit_cost:
+            # Evaluate the cost function up front so the rows can be computed with NumPy
+            table = _CostTable.create(original, modified, cost_fn)
+            if table:
+                original, modified, cost_fn = table.original, table.modified, table
+
         if len(original) < len(modified):
-            swapped_cost_fn = lambda a, b: real_cost_fn(b, a)
-            result = cls._infer_recursive(modified, original, swapped_cost_fn)
-            return Alignment(result).inverse()
+            swapped_cost_fn: CostFn[U, T]
+            if cost_fn is _unit_cost:
+                # Keep the unit cost recognizable, since it's symmetric anyway
+                swapped_cost_fn = cost_fn
+            elif isinstance(cost_fn, _CostTable):
+                swapped_cost_fn = cost_fn.transpose()
+            else:
+                swapped_cost_fn = partial(_swapped_cost, cost_fn)
+            return cls._infer(modified, original, swapped_cost_fn, max_distance, executor).inverse()
         else:
-            result = cls._infer_recursive(original, modified, real_cost_fn)
-            return Alignment(result)
+            return cls._infer(original, modified, cost_fn, max_distance, executor)
+
+    @classmethod
+    def _infer_anchored(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], max_distance: Optional[Real], executor: Optional[Executor] = None) -> Alignment:
+        """
+        Align the common prefix, common suffix, and blocks that occur exactly once in both sequences directly, as in
+        patience diff, and only run the dynamic programming algorithm on the gaps between them.
+        """
+
+        runs = _Runs(_get_storage(None))
+        snake = _Snake(original, modified)
+
+        # Same explicit stack as _infer_myers()
+        stack: List[Tuple[int, ...]] = [(0, len(original), 0, len(modified))]
+        while stack:
+            task = stack.pop()
+            if len(task) == 3:
+                runs.append_run(*task)
+                continue
+
+            olo, ohi, mlo, mhi = task
+
+            prefix = snake.forward(olo, ohi, mlo, mhi)
+            runs.append_run(olo, mlo, prefix)
+            olo += prefix
+            mlo += prefix
+
+            suffix = snake.backward(olo, ohi, mlo, mhi)
+            ohi -= suffix
+            mhi -= suffix
+            stack.append((ohi, mhi, suffix))
+
+            # Not worth it for small gaps
+            if (ohi - olo) * (mhi - mlo) > 1024:
+                anchors = cls._find_anchors(snake, olo, ohi, mlo, mhi)
+            else:
+                anchors = []
+
+            if anchors:
+                tasks: List[Tuple[int, ...]] = []
+                for o, m, n in anchors:
+                    tasks.append((olo, o, mlo, m))
+                    tasks.append((o, m, n))
+                    olo, mlo = o + n, m + n
+                tasks.append((olo, ohi, mlo, mhi))
+                stack.extend(reversed(tasks))
+                continue
+
+            gap = cls._infer_exact(original[olo:ohi], modified[mlo:mhi], cost_fn, max_distance, executor)
+            for o, m in gap:
+                runs.append(olo + o, mlo + m)
+
+        return cls._from_runs(runs)
+
+    @classmethod
+    def _find_anchors(cls, snake: _Snake[T, U], olo: int, ohi: int, mlo: int, mhi: int) -> List[Tuple[int, int, int]]:
+        """
+        Find maximal matching blocks ``(o, m, n)`` that contain a k-mer that is unique within both ranges.
+
+        The k-mers are long enough that two unrelated sequences of this length and alphabet would be unlikely to share
+        any of them by chance, so that most anchors reflect text that really was kept.
+        """
+
+        try:
+            alphabet = len(set(snake.original[olo:ohi]).union(snake.modified[mlo:mhi]))
+            if alphabet < 2:
+                return []
+            k = max(4, math.ceil(2 * math.log(ohi - olo + mhi - mlo) / math.log(alphabet)))
+
+            original = _unique_kmers(snake.original, olo, ohi, k)
+            modified = _unique_kmers(snake.modified, mlo, mhi, k)
+        except TypeError:
+            # Unhashable elements
+            return []
+
+        matches = sorted((o, modified[kmer]) for kmer, o in original.items() if kmer in modified)
+
+        # Patience sorting to find the longest chain of matches that is increasing in both sequences
+        tails: List[int] = []
+        tail_indices: List[int] = []
+        links: List[int] = []
+        for i, (o, m) in enumerate(matches):
+            j = bisect.bisect_left(tails, m)
+            links.append(tail_indices[j - 1] if j > 0 else -1)
+            if j == len(tails):
+                tails.append(m)
+                tail_indices.append(i)
+            else:
+                tails[j] = m
+                tail_indices[j] = i
+
+        chain_indices = []
+        i = tail_indices[-1] if tail_indices else -1
+        while i >= 0:
+            chain_indices.append(i)
+            i = links[i]
+        chain_indices.reverse()
+
+        blocks: List[Tuple[int, int, int]] = []
+        for i in chain_indices:
+            o, m = matches[i]
+            if blocks:
+                bo, bm, bn = blocks[-1]
+                if o - bo == m - bm and o <= bo + bn:
+                    blocks[-1] = (bo, bm, o + k - bo)
+                    continue
+                elif o < bo + bn or m < bm + bn:
+                    continue
+            blocks.append((o, m, k))
+
+        # Drop blocks that are too short to pay for the insertions and deletions needed to move to their diagonal and
+        # back, since they're probably inconsistent with the optimal alignment (e.g. a block that was moved)
+        consistent: List[Tuple[int, int, int]] = []
+        prev = olo - mlo
+        for i, (o, m, n) in enumerate(blocks):
+            if i + 1 < len(blocks):
+                no, nm, _ = blocks[i + 1]
+                following = no - nm
+            else:
+                following = ohi - mhi
+            diagonal = o - m
+            if abs(prev - diagonal) + abs(diagonal - following) - abs(prev - following) < n:
+                consistent.append((o, m, n))
+                prev = diagonal
+        blocks = consistent
+
+        # Extend the blocks as far as they match
+        result: List[Tuple[int, int, int]] = []
+        po, pm = olo, mlo
+        for i, (o, m, n) in enumerate(blocks):
+            if i + 1 < len(blocks):
+                no, nm, _ = blocks[i + 1]
+            else:
+                no, nm = ohi, mhi
+            n += snake.forward(o + n, no, m + n, nm)
+            before = snake.backward(po, o, pm, m)
+            o -= before
+            m -= before
+            n += before
+            result.append((o, m, n))
+            po, pm = o + n, m + n
+
+        return result
+
+    @classmethod
+    def _infer(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U], max_distance: Optional[Real], executor: Optional[Executor] = None) -> Alignment:
+        if max_distance is None and executor is not None:
+            return cls._infer_parallel(original, modified, cost_fn, executor)
+        elif max_distance is None:
+            runs = _Runs(_get_storage(None))
+            cls._infer_recursive(original, modified, cost_fn, runs, 0, len(original), 0, len(modified))
+            return cls._from_runs(runs)
+        else:
+            return cls._infer_banded(original, modified, cost_fn, max_distance)
 
     def __iter__(self) -> Iterator[BiIndex]:
-        return zip(self._original, self._modified)
+        return chain.from_iterable(
+            zip(range(o, o + n + 1), range(m, m + n + 1))
+            for o, m, n in zip(self._original, self._modified, self._lengths)
+        )
 
     def __len__(self) -> int:
-        return len(self._original)
+        return self._get_offsets()[-1]
 
     @overload
     def __getitem__(self, index: int) -> BiIndex: ...
@@ -367,13 +1137,26 @@ class Alignment:
             Alignment.identity(1, 4)
         """
 
+        length = len(self)
+
         if isinstance(index, slice):
-            start, stop, stride = index.indices(len(self))
+            start, stop, stride = index.indices(length)
             if stride != 1:
                 raise ValueError('Non-unit strides not supported')
-            return self._create(self._original[index], self._modified[index])
+
+            runs = _Runs(self._storage())
+            if start < stop:
+                for o, m, n in self._runs(self._locate(start), self._locate(stop - 1)):
+                    runs.append_run(o, m, n)
+            return self._from_runs(runs)
         else:
-            return (self._original[index], self._modified[index])
+            if index < 0:
+                index += length
+            if index < 0 or index >= length:
+                raise IndexError('Alignment index out of range')
+
+            s, k = self._locate(index)
+            return (self._original[s] + k, self._modified[s] + k)
 
     def shift(self, delta_o: int, delta_m: int) -> Alignment:
         """
@@ -387,30 +1170,50 @@ class Alignment:
             An alignment with all the positions shifted by the given amounts.
         """
 
-        return self._create(
-            [o + delta_o for o in self._original],
-            [m + delta_m for m in self._modified],
+        storage = self._storage()
+        result = self._create(
+            storage(o + delta_o for o in self._original),
+            storage(m + delta_m for m in self._modified),
+            self._lengths,
         )
+        result._offsets = self._offsets
+        return result
 
-    def _search(self, source: List[int], start: int, stop: int) -> Bounds:
-        first = bisect.bisect_right(source, start)
-        if first == 0:
-            raise IndexError('range start too small')
-        first -= 1
+    def _search(self, source: IntSeq, start: int, stop: int) -> Tuple[BiIndex, BiIndex]:
+        """
+        Find the last pair whose `source` position is at most `start`, and the first pair after it whose `source`
+        position is at least `stop`, as ``(run, step)`` positions.
+        """
+
+        lengths = self._lengths
 
-        last = bisect.bisect_left(source, stop, first)
-        if last == len(source):
+        s = bisect.bisect_right(source, start) - 1
+        if s < 0:
+            raise IndexError('range start too small')
+        k = min(start - source[s], lengths[s])
+
+        t = bisect.bisect_left(source, stop, s)
+        if t > s and source[t - 1] + lengths[t - 1] >= stop:
+            t -= 1
+            l = stop - source[t]
+            if t == s:
+                l = max(l, k)
+        elif t == s:
+            l = k
+        elif t == len(source):
             raise IndexError('range end too big')
+        else:
+            l = 0
 
-        return first, last
+        return (s, k), (t, l)
 
-    def _bounds(self, source: List[int], target: List[int], args: Tuple[AnyBounds, ...]) -> Bounds:
+    def _bounds(self, source: IntSeq, target: IntSeq, args: Tuple[AnyBounds, ...]) -> Bounds:
         start, stop = self._parse_optional_bounds(args)
         if start is None or stop is None:
-            i, j = 0, -1
+            (s, k), (t, l) = (0, 0), self._last()
         else:
-            i, j = self._search(source, start, stop)
-        return (target[i], target[j])
+            (s, k), (t, l) = self._search(source, start, stop)
+        return (target[s] + k, target[t] + l)
 
     def original_bounds(self, *args: AnyBounds) -> Bounds:
         """
@@ -448,6 +1251,125 @@ class Alignment:
         """
         return slice(*self.original_bounds(*args))
 
+    def _bounds_many(self, source: IntSeq, target: IntSeq, starts: Sequence[int], stops: Sequence[int], mask: bool) -> Union[ManyBounds, MaskedBounds]:
+        if len(starts) != len(stops):
+            raise ValueError('starts and stops must have the same length')
+
+        np = import_numpy()
+        if np is None:
+            return self._bounds_many_python(source, target, starts, stops, mask)
+
+        result = self._bounds_many_numpy(np, source, target, starts, stops, mask)
+        if not isinstance(starts, np.ndarray) and not isinstance(stops, np.ndarray):
+            result = tuple(values.tolist() for values in result)
+        return cast(Union[ManyBounds, MaskedBounds], result)
+
+    def _bounds_many_python(self, source: IntSeq, target: IntSeq, starts: Sequence[int], stops: Sequence[int], mask: bool) -> Union[ManyBounds, MaskedBounds]:
+        search = self._search
+        first: List[int] = []
+        last: List[int] = []
+        valid: List[bool] = []
+
+        for start, stop in zip(starts, stops):
+            try:
+                (s, k), (t, l) = search(source, start, stop)
+            except IndexError:
+                if not mask:
+                    raise
+                first.append(-1)
+                last.append(-1)
+                valid.append(False)
+            else:
+                first.append(target[s] + k)
+                last.append(target[t] + l)
+                valid.append(True)
+
+        if mask:
+            return first, last, valid
+        else:
+            return first, last
+
+    def _bounds_many_numpy(self, np: Any, source: IntSeq, target: IntSeq, starts: Sequence[int], stops: Sequence[int], mask: bool) -> Any:
+        # A vectorized version of _search()
+        source = np.asarray(source, dtype=np.int64)
+        target = np.asarray(target, dtype=np.int64)
+        lengths = np.asarray(self._lengths, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+
+        s = np.searchsorted(source, starts, side='right') - 1
+        start_ok = s >= 0
+        s[~start_ok] = 0
+        k = np.minimum(starts - source[s], lengths[s])
+
+        t = np.maximum(np.searchsorted(source, stops, side='left'), s)
+        prev = np.maximum(t - 1, 0)
+        in_prev = (t > s) & (source[prev] + lengths[prev] >= stops)
+        at_first = ~in_prev & (t == s)
+        stop_ok = in_prev | at_first | (t < len(source))
+
+        l = np.where(in_prev, stops - source[prev], 0)
+        l = np.where(in_prev & (prev == s), np.maximum(l, k), l)
+        l = np.where(at_first, k, l)
+        t = np.where(in_prev, prev, t)
+        t[~stop_ok] = 0
+
+        first = target[s] + k
+        last = target[t] + l
+
+        valid = start_ok & stop_ok
+        if mask:
+            first[~valid] = -1
+            last[~valid] = -1
+            return first, last, valid
+
+        if not np.all(valid):
+            i = np.argmin(valid)
+            if start_ok[i]:
+                raise IndexError('range end too big')
+            else:
+                raise IndexError('range start too small')
+        return first, last
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Maps many subranges of the modified sequence to the original sequence at once.  Equivalent to calling
+        :meth:`original_bounds` on each span, but much faster for large batches:
+
+            >>> a = Alignment.identity(5).shift(1, 0)
+            >>> a.original_bounds_many([0, 1], [2, 3])
+            ([1, 2], [3, 4])
+
+        If NumPy is installed, the spans are mapped with vectorized searches, and NumPy arrays are returned when NumPy
+        arrays are passed in.
+
+        :param starts:
+            The start of each span.
+        :param stops:
+            The end of each span.
+        :param mask:
+            If ``False`` (the default), an :class:`IndexError` is raised if any span is out of bounds.  If ``True``,
+            out of bounds spans are mapped to ``(-1, -1)`` instead, and a third sequence is returned that is ``True``
+            for each span that was mapped successfully:
+
+                >>> a.original_bounds_many([0, 4], [2, 6], mask=True)
+                ([1, -1], [3, -1], [True, False])
+
+        :returns:
+            The starts and ends of the corresponding bounds in the original sequence.
+        """
+
+        return self._bounds_many(self._modified, self._original, starts, stops, mask)
+
     def modified_bounds(self, *args: AnyBounds) -> Bounds:
         """
         Maps a subrange of the original sequence to the modified sequence.  Can be called with either two arguments:
@@ -484,6 +1406,53 @@ class Alignment:
         """
         return slice(*self.modified_bounds(*args))
 
+    def _slice_by(self, source: IntSeq, args: Tuple[AnyBounds, ...], by_original: bool) -> Alignment:
+        start, stop = self._parse_bounds(args)
+        first, last = self._search(source, start, stop)
+        runs = list(self._runs(first, last))
+
+        # Only the first and last pairs can lie outside the bounds, and if they do, they're not part of a longer run
+        o, m, n = runs[0]
+        if by_original:
+            runs[0] = (min(max(o, start), stop), m, n)
+        else:
+            runs[0] = (o, min(max(m, start), stop), n)
+
+        o, m, n = runs[-1]
+        if by_original:
+            runs[-1] = (o if n else min(max(o, start), stop), m, n)
+        else:
+            runs[-1] = (o, m if n else min(max(m, start), stop), n)
+
+        result = _Runs(self._storage())
+        for o, m, n in runs:
+            result.append_run(o, m, n)
+        return self._from_runs(result)
+
+    @overload
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Maps many subranges of the original sequence to the modified sequence at once.  Equivalent to calling
+        :meth:`modified_bounds` on each span (see :meth:`original_bounds_many`):
+
+            >>> a = Alignment.identity(5).shift(1, 0)
+            >>> a.modified_bounds_many([1, 2], [3, 4])
+            ([0, 1], [2, 3])
+
+        :returns:
+            The starts and ends of the corresponding bounds in the modified sequence.
+        """
+
+        return self._bounds_many(self._original, self._modified, starts, stops, mask)
+
     def slice_by_original(self, *args: AnyBounds) -> Alignment:
         """
         Slice this alignment by a span of the original sequence.
@@ -496,12 +1465,7 @@ class Alignment:
             The slice of this alignment that corresponds with the given span of the original sequence.
         """
 
-        start, stop = self._parse_bounds(args)
-        first, last = self._search(self._original, start, stop)
-        original = self._original[first:last+1]
-        original = [min(max(i, start), stop) for i in original]
-        modified = self._modified[first:last+1]
-        return self._create(original, modified)
+        return self._slice_by(self._original, args, True)
 
     def slice_by_modified(self, *args: AnyBounds) -> Alignment:
         """
@@ -515,12 +1479,7 @@ class Alignment:
             The slice of this alignment that corresponds with the given span of the modified sequence.
         """
 
-        start, stop = self._parse_bounds(args)
-        first, last = self._search(self._modified, start, stop)
-        original = self._original[first:last+1]
-        modified = self._modified[first:last+1]
-        modified = [min(max(i, start), stop) for i in modified]
-        return self._create(original, modified)
+        return self._slice_by(self._modified, args, False)
 
     def __add__(self, other: Any) -> Alignment:
         """
@@ -530,18 +1489,17 @@ class Alignment:
         if not isinstance(other, Alignment):
             return NotImplemented
 
-        o_orig = other._original
-        o_mod = other._modified
-
-        if o_orig[0] < self._original[-1]:
+        last_o, last_m = self[-1]
+        if other._original[0] < last_o:
             raise ValueError('Original sequence position moved backwards')
-        elif o_mod[0] < self._modified[-1]:
+        elif other._modified[0] < last_m:
             raise ValueError('Modified sequence position moved backwards')
-        elif o_orig[0] == self._original[-1] and o_mod[0] == self._modified[-1]:
-            o_orig = o_orig[1:]
-            o_mod = o_mod[1:]
 
-        return self._create(self._original + o_orig, self._modified + o_mod)
+        runs = _Runs(self._storage())
+        for alignment in (self, other):
+            for o, m, n in zip(alignment._original, alignment._modified, alignment._lengths):
+                runs.append_run(o, m, n)
+        return self._from_runs(runs)
 
     def compose(self, other: Alignment) -> Alignment:
         """
@@ -552,39 +1510,355 @@ class Alignment:
         if self.modified_bounds() != other.original_bounds():
             raise ValueError('Incompatible alignments')
 
-        original = []
-        modified = []
-        i, i_max = 0, len(self)
-        j, j_max = 0, len(other)
+        # Composing with an identity alignment only drops redundant pairs, which is common for text that hasn't been
+        # modified
+        if other._is_identity():
+            return self._drop_inner_pairs(self._storage())
+        elif self._is_identity():
+            return other._drop_inner_pairs(self._storage())
+
+        # Positions are (run, step) pairs; i = (s, k) walks through self, and j = (t, l) walks through other
+        s_orig, s_mod, s_len = self._original, self._modified, self._lengths
+        o_orig, o_mod, o_len = other._original, other._modified, other._lengths
+        s_max = len(s_len)
 
-        while i < i_max:
+        runs = _Runs(self._storage())
+        s, k = 0, 0
+        t, l = 0, 0
+
+        while s < s_max:
             # Map self._original[i] to its lower bound in other
-            while self._modified[i] > other._original[j]:
-                j += 1
-            while self._modified[i] < other._original[j] and self._modified[i + 1] <= other._original[j]:
-                i += 1
-            original.append(self._original[i])
-            modified.append(other._modified[j])
+            i_mod = s_mod[s] + k
+            t, l = _seek(o_orig, o_len, t, l, i_mod)
+            j_orig = o_orig[t] + l
+            if i_mod < j_orig:
+                p, q = _seek(s_mod, s_len, s, k, j_orig)
+                if s_mod[p] + q == j_orig:
+                    s, k = p, q
+                else:
+                    s, k = _prev(s_len, p, q)
+                i_mod = s_mod[s] + k
+
+            if i_mod == j_orig and k < s_len[s] and l < o_len[t]:
+                # Both alignments are in the middle of a run, so their composition is too
+                r = min(s_len[s] - k, o_len[t] - l)
+                runs.append_run(s_orig[s] + k, o_mod[t] + l, r - 1)
+                k += r
+                l += r
+                continue
+
+            runs.append(s_orig[s] + k, o_mod[t] + l)
 
             # Map self._original[i] to its upper bound in other (if it's different)
-            while i + 1 < i_max and self._original[i] == self._original[i + 1]:
-                i += 1
+            while k == s_len[s] and s + 1 < s_max and s_orig[s + 1] == s_orig[s] + k:
+                s, k = s + 1, 0
+
+            p, q = _seek(o_orig, o_len, t, l, s_mod[s] + k + 1)
+            if (p, q) != (t, l):
+                p, q = _prev(o_len, p, q)
+                if (p, q) != (t, l):
+                    t, l = p, q
+                    runs.append(s_orig[s] + k, o_mod[t] + l)
+
+            if k < s_len[s]:
+                k += 1
+            else:
+                s, k = s + 1, 0
 
-            needs_upper = False
-            while j + 1 < j_max and self._modified[i] >= other._original[j + 1]:
-                needs_upper = True
-                j += 1
-            if needs_upper:
-                original.append(self._original[i])
-                modified.append(other._modified[j])
+        return self._from_runs(runs)
 
-            i += 1
+    def _drop_inner_pairs(self, storage: Storage) -> Alignment:
+        """
+        Drop the pairs between the first and last ones with the same original position, as :meth:`compose` would.  Only
+        looks at the runs, and returns this alignment itself if there are none and the storage already matches.
+        """
+
+        orig, mod, lengths = self._original, self._modified, self._lengths
+        last = len(lengths) - 1
+        inner = [
+            s for s in range(1, last)
+            if lengths[s] == 0 and orig[s - 1] + lengths[s - 1] == orig[s] == orig[s + 1]
+        ] if last > 1 else []
 
-        return self._create(original, modified)
+        if not inner:
+            if self._storage() is storage:
+                return self
+            else:
+                return self._create(storage(orig), storage(mod), storage(lengths))
+
+        runs = _Runs(storage)
+        skip = iter(inner)
+        next_skip = next(skip)
+        for s in range(last + 1):
+            if s == next_skip:
+                next_skip = next(skip, -1)
+            else:
+                runs.append_run(orig[s], mod[s], lengths[s])
+        return self._from_runs(runs)
 
     def inverse(self) -> Alignment:
         """
         :returns:
             The inverse of this alignment, from the modified to the original sequence.
         """
-        return self._create(self._modified, self._original)
+        result = self._create(self._modified, self._original, self._lengths)
+        result._offsets = self._offsets
+        return result
+
+
+def _seek(starts: IntSeq, lengths: IntSeq, s: int, k: int, value: int) -> BiIndex:
+    """
+    Find the first position at or after ``(s, k)`` whose value is at least `value`.
+    """
+
+    s_max = len(starts)
+    while s < s_max:
+        start = starts[s]
+        if start + lengths[s] >= value:
+            return s, max(k, value - start)
+        s, k = s + 1, 0
+    return s, 0
+
+
+def _prev(lengths: IntSeq, s: int, k: int) -> BiIndex:
+    """
+    Find the position just before ``(s, k)``.
+    """
+
+    if k > 0:
+        return s, k - 1
+    else:
+        return s - 1, lengths[s - 1]
+
+
+def _as_slice(indices: range) -> slice:
+    """
+    Convert a range of indices to the equivalent slice.
+    """
+
+    if not indices:
+        return slice(0, 0)
+
+    if indices.stop < 0:
+        return slice(indices.start, None, indices.step)
+    else:
+        return slice(indices.start, indices.stop, indices.step)
+
+
+# Subproblems with fewer cells than this are solved sequentially by Alignment._infer_parallel()
+_PARALLEL_CELLS = 1 << 20
+
+
+def _myers_limit(olength: int, mlength: int) -> int:
+    """
+    The largest cost ``d`` that :meth:`Alignment._infer_myers` searches for a middle snake before falling back to
+    Hirschberg's algorithm.  Finishing the search would take about ``O(d**2)`` steps, while the bit-parallel Hirschberg
+    algorithm takes about ``O(N*log(N))`` row operations, each on integers with one bit per element.  The constants were
+    measured on random text, and put the crossover roughly where the two take the same time.
+    """
+
+    total = olength + mlength
+    return math.isqrt(total * total.bit_length() * (total + (1 << 17)) // (24 << 17))
+
+
+def _swapped_cost(cost_fn: CostFn[T, U], a: Optional[U], b: Optional[T]) -> Real:
+    """
+    A cost function with its arguments swapped (in a picklable way, unlike a lambda).
+    """
+    return cost_fn(b, a)
+
+
+def _unit_cost(a: Any, b: Any) -> int:
+    """
+    The default cost function for :meth:`Alignment.infer`.
+    """
+    return int(a != b)
+
+
+class _CostTable:
+    """
+    A cost function evaluated ahead of time for every distinct pair of elements, so that :meth:`Alignment._infer_costs`
+    can run at NumPy speed.  The sequences are replaced by arrays of indices into the table.
+    """
+
+    def __init__(self, original: Any, modified: Any, replace: Any, delete: Any, insert: Any):
+        self.original = original
+        self.modified = modified
+        self.replace = replace
+        self.delete = delete
+        self.insert = insert
+
+    @classmethod
+    def create(cls, original: Sequence[T], modified: Sequence[U], cost_fn: CostFn[T, U]) -> Optional[_CostTable]:
+        """
+        :returns:
+            The cost table, or ``None`` if NumPy is unavailable or the costs can't be computed exactly with it.
+        """
+
+        np = import_numpy()
+        if np is None or not original or not modified:
+            return None
+
+        try:
+            ovalues: Dict[T, int] = {}
+            oindices = [ovalues.setdefault(o, len(ovalues)) for o in original]
+            mvalues: Dict[U, int] = {}
+            mindices = [mvalues.setdefault(m, len(mvalues)) for m in modified]
+        except TypeError:
+            # Unhashable elements
+            return None
+
+        # Don't use more memory than the sequences themselves would
+        if len(ovalues) * len(mvalues) > max(len(original) * len(modified) // 4, 1 << 16):
+            return None
+
+        replace = [cost_fn(o, m) for o in ovalues for m in mvalues]
+        delete = [cost_fn(o, None) for o in ovalues]
+        insert = [cost_fn(None, m) for m in mvalues]
+
+        # The vectorized rows use prefix sums, which are only exact for (reasonably small) integers
+        limit = 1 << 40
+        costs = chain(replace, delete, insert)
+        if not all(isinstance(c, int) and -limit < c < limit for c in costs):
+            return None
+
+        return cls(
+            np.array(oindices, dtype=np.intp),
+            np.array(mindices, dtype=np.intp),
+            np.array(replace, dtype=np.int64).reshape(len(ovalues), len(mvalues)),
+            np.array(delete, dtype=np.int64),
+            np.array(insert, dtype=np.int64),
+        )
+
+    def __call__(self, a: Any, b: Any) -> int:
+        if a is None:
+            return int(self.insert[b])
+        elif b is None:
+            return int(self.delete[a])
+        else:
+            return int(self.replace[a, b])
+
+    def transpose(self) -> _CostTable:
+        return _CostTable(self.modified, self.original, self.replace.T, self.insert, self.delete)
+
+    def costs(self, original: Any, modified: Any) -> List[Real]:
+        """
+        Compute the last row of costs like :meth:`Alignment._infer_costs`.  Each row is computed from the previous one
+        by taking the cheaper of replacement and deletion for every cell at once, then propagating insertions along the
+        row with a running minimum:
+
+            row[j] = min(t[j], row[j - 1] + insert[j]) = C[j] + min(t[k] - C[k] for k <= j)
+
+        where ``C`` is the prefix sum of the insertion costs.
+        """
+
+        np = import_numpy()
+
+        prefix = np.zeros(len(modified) + 1, dtype=np.int64)
+        np.cumsum(self.insert[modified], out=prefix[1:])
+
+        row = prefix.copy()
+        t = np.empty_like(row)
+        for o in original:
+            replace = self.replace[o, modified]
+            delete = self.delete[o]
+            t[0] = row[0] + delete
+            np.minimum(row[:-1] + replace, row[1:] + delete, out=t[1:])
+            t -= prefix
+            np.minimum.accumulate(t, out=row)
+            row += prefix
+
+        return cast(List[Real], row.tolist())
+
+
+def _hashable(seq: Sequence[Any]) -> bool:
+    """
+    Check whether all the elements of a sequence are hashable, without copying them.
+    """
+
+    if isinstance(seq, str):
+        return True
+
+    try:
+        for item in seq:
+            hash(item)
+    except TypeError:
+        return False
+    return True
+
+
+def _unique_kmers(seq: Sequence[Any], start: int, stop: int, k: int) -> Dict[Hashable, int]:
+    """
+    :returns:
+        A map from each k-mer that occurs exactly once in ``seq[start:stop]`` to its position.
+    """
+
+    if isinstance(seq, str):
+        kmers: Iterable[Hashable] = (seq[i:i+k] for i in range(start, stop - k + 1))
+    else:
+        kmers = (tuple(seq[i:i+k]) for i in range(start, stop - k + 1))
+
+    positions: Dict[Hashable, int] = {}
+    for i, kmer in enumerate(kmers, start):
+        positions[kmer] = -1 if kmer in positions else i
+    return {kmer: i for kmer, i in positions.items() if i >= 0}
+
+
+class _Snake(Generic[T, U]):
+    """
+    Finds the lengths of common prefixes and suffixes ("snakes") of subranges of two sequences.
+    """
+
+    def __init__(self, original: Sequence[T], modified: Sequence[U]):
+        self.original = original
+        self.modified = modified
+        # Comparing slices is much faster than comparing elements one at a time, but only equivalent for some types
+        self.sliceable = type(original) is type(modified) and isinstance(original, (str, list, tuple))
+
+    def forward(self, olo: int, ohi: int, mlo: int, mhi: int) -> int:
+        """
+        :returns:
+            The length of the common prefix of ``original[olo:ohi]`` and ``modified[mlo:mhi]``.
+        """
+
+        original, modified = self.original, self.modified
+        limit = min(ohi - olo, mhi - mlo)
+        n = 0
+
+        if self.sliceable:
+            step = 8
+            while step > 0:
+                while n + step <= limit and original[olo+n:olo+n+step] == modified[mlo+n:mlo+n+step]:
+                    n += step
+                    step *= 2
+                step //= 2
+
+        while n < limit and original[olo + n] == modified[mlo + n]:
+            n += 1
+        return n
+
+    def backward(self, olo: int, ohi: int, mlo: int, mhi: int) -> int:
+        """
+        :returns:
+            The length of the common suffix of ``original[olo:ohi]`` and ``modified[mlo:mhi]``.
+        """
+
+        original, modified = self.original, self.modified
+        limit = min(ohi - olo, mhi - mlo)
+        n = 0
+
+        if self.sliceable:
+            step = 8
+            while step > 0:
+                while n + step <= limit and original[ohi-n-step:ohi-n] == modified[mhi-n-step:mhi-n]:
+                    n += step
+                    step *= 2
+                step //= 2
+
+        while n < limit and original[ohi - n - 1] == modified[mhi - n - 1]:
+            n += 1
+        return n
+
+
+if TYPE_CHECKING:
+    from ._cache import InferCache
@@ -5,12 +5,12 @@ from __future__ import annotations
 
 __all__ = ['bistr']
 
-from itertools import islice
-from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union, overload, TYPE_CHECKING
-import unicodedata
+from concurrent.futures import Executor
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Mapping, Optional, Sequence, Tuple, Union, overload, TYPE_CHECKING
 
 from ._alignment import Alignment
-from ._typing import BiIndex, Bounds, Index, Regex, Replacement
+from ._typing import BiIndex, Bounds, Edit, Index, ManyBounds, MaskedBounds, Regex, Replacement, TranslationTable
 
 
 Real = Union[int, float]
@@ -22,7 +22,7 @@ class bistr:
     A bidirectionally transformed string.
     """
 
-    __slots__ = ('original', 'modified', 'alignment')
+    __slots__ = ('original', 'modified', 'alignment', '_view')
 
     original: str
     """
@@ -80,7 +80,12 @@ class bistr:
         if modified is None:
             modified = original
             if alignment is None:
-                alignment = Alignment.identity(len(original))
+                # An identity alignment is trivially compatible, so skip the validation below
+                result: bistr = object.__new__(cls)
+                object.__setattr__(result, 'original', original)
+                object.__setattr__(result, 'modified', original)
+                object.__setattr__(result, 'alignment', Alignment.identity(len(original)))
+                return result
         elif isinstance(modified, str):
             if alignment is None:
                 alignment = Alignment([(0, 0), (len(original), len(modified))])
@@ -95,14 +100,14 @@ class bistr:
         elif alignment.modified_bounds() != (0, len(modified)):
             raise ValueError('Alignment incompatible with modified string')
 
-        result: bistr = object.__new__(cls)
+        result = object.__new__(cls)
         object.__setattr__(result, 'original', original)
         object.__setattr__(result, 'modified', modified)
         object.__setattr__(result, 'alignment', alignment)
         return result
 
     @classmethod
-    def infer(cls, original: str, modified: str, cost_fn: Optional[CostFn] = None) -> bistr:
+    def infer(cls, original: str, modified: str, cost_fn: Optional[CostFn] = None, *, max_distance: Optional[Real] = None, anchor: bool = False, workers: Optional[int] = None, executor: Optional[Executor] = None, cache: Optional[InferCache] = None, cache_key: Optional[str] = None) -> bistr:
         """
         Create a `bistr`, automatically inferring an alignment between the `original` and `modified` strings.
 
@@ -143,15 +148,36 @@ class bistr:
             The modified string.
         :param cost_fn:
             A function returning the cost of performing an edit (see :meth:`Alignment.infer`).
+        :param max_distance:
+            An estimate of the cost of the optimal alignment, which can speed up inference for similar strings.  It
+            selects Hirschberg's algorithm, which is the only one that supports it (see :meth:`Alignment.infer`).
+        :param anchor:
+            Whether to align exactly matching prefixes, suffixes, and unique blocks up front, which is much faster for
+            long strings but makes the alignment a heuristic that isn't always optimal (see :meth:`Alignment.infer`).
+        :param workers:
+            The number of processes to infer the alignment with in parallel.  Ignored if `max_distance` is given (see
+            :meth:`Alignment.infer`).
+        :param executor:
+            An existing :class:`concurrent.futures.Executor` to use instead of `workers`.
+        :param cache:
+            An :class:`InferCache` to reuse alignments inferred previously, e.g. when reprocessing a corpus.
+        :param cache_key:
+            A string identifying `cost_fn` in the `cache`, if its name doesn't (see :meth:`Alignment.infer`).
         :returns:
             A `bistr` with the inferred alignment.
         """
 
         if cost_fn:
-            return cls(original, modified, Alignment.infer(original, modified, cost_fn))
+            return cls(original, modified, Alignment.infer(
+                original, modified, cost_fn,
+                max_distance=max_distance, anchor=anchor, workers=workers, executor=executor, cache=cache, cache_key=cache_key,
+            ))
         else:
             from ._infer import heuristic_infer
-            return heuristic_infer(original, modified)
+            return heuristic_infer(
+                original, modified,
+                max_distance=max_distance, anchor=anchor, workers=workers, executor=executor, cache=cache,
+            )
 
     def __str__(self) -> str:
         if self.original == self.modified:
@@ -160,7 +186,7 @@ class bistr:
             return f'({self.original!r} ⇋ {self.modified!r})'
 
     def __repr__(self) -> str:
-        if self.original == self.modified and len(self.alignment) == len(self.original) + 1:
+        if self.alignment._is_identity() and self.original == self.modified:
             return f'bistr({self.original!r})'
         elif len(self.alignment) == 2:
             return f'bistr({self.original!r}, {self.modified!r})'
@@ -225,23 +251,71 @@ class bistr:
             >>> s = bistr('TEST').lower()
             >>> s[1:3]
             bistr('ES', 'es', Alignment.identity(2))
+
+        Slicing takes ``O(log N)`` time, as the substrings and alignment of the slice are only computed when they're
+        first accessed.
         """
 
         if isinstance(index, slice):
-            start, stop, stride = index.indices(len(self))
+            # Slices are views of the same parent string, that only copy what they need when it's first accessed
+            try:
+                parent, _, _, vmstart, vmstop = object.__getattribute__(self, '_view')
+            except AttributeError:
+                parent = self
+                vmstart = 0
+                vmstop = len(self.modified)
+
+            start, stop, stride = index.indices(vmstop - vmstart)
             if stride != 1:
                 raise ValueError('Non-unit strides not supported')
+            # Reversed slices are empty, like for str
+            stop = max(stop, start)
+
+            start += vmstart
+            stop += vmstart
+            if parent is not self and (start == vmstop or stop == vmstart):
+                # The alignment of a slice is clamped to its bounds, so it has nothing at its ends
+                return bistr('')
+
+            ostart, ostop = parent.alignment.original_bounds(start, stop)
+            result: bistr = object.__new__(bistr)
+            object.__setattr__(result, '_view', (parent, ostart, ostop, start, stop))
+            return result
+        else:
+            return self.modified[index]
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Lazily computes the attributes of slices.
+        """
 
-            alignment = self.alignment.slice_by_modified(start, stop)
-            modified = self.modified[start:stop]
-            original = self.original[alignment.original_slice()]
+        if name not in ('original', 'modified', 'alignment'):
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
 
-            o0, m0 = alignment[0]
-            alignment = alignment.shift(-o0, -m0)
+        try:
+            parent, ostart, ostop, mstart, mstop = object.__getattribute__(self, '_view')
+        except AttributeError:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}') from None
 
-            return bistr(original, modified, alignment)
+        value: Any
+        if name == 'original':
+            value = parent.original[ostart:ostop]
+        elif name == 'modified':
+            value = parent.modified[mstart:mstop]
         else:
-            return self.modified[index]
+            value = parent.alignment.slice_by_modified(mstart, mstop).shift(-ostart, -mstart)
+        object.__setattr__(self, name, value)
+
+        # Don't keep the parent alive once it's no longer needed
+        try:
+            for attr in ('original', 'modified', 'alignment'):
+                object.__getattribute__(self, attr)
+        except AttributeError:
+            pass
+        else:
+            object.__delattr__(self, '_view')
+
+        return value
 
     def __setattr__(self, name: str, value: Any) -> None:
         raise AttributeError('bistr is immutable')
@@ -249,6 +323,43 @@ class bistr:
     def __delattr__(self, name: str) -> None:
         raise AttributeError('bistr is immutable')
 
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Map many spans of the modified string to the corresponding spans of the original string at once.
+
+            >>> s = bistr('  Hello, World!  ').strip().lower()
+            >>> s.original_bounds_many([0, 7], [5, 12])
+            ([2, 9], [7, 14])
+
+        See :meth:`Alignment.original_bounds_many` for details.
+        """
+        return self.alignment.original_bounds_many(starts, stops, mask=mask)
+
+    @overload
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def modified_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Map many spans of the original string to the corresponding spans of the modified string at once.  See
+        :meth:`Alignment.modified_bounds_many` for details.
+        """
+        return self.alignment.modified_bounds_many(starts, stops, mask=mask)
+
     def inverse(self) -> bistr:
         """
         :returns: The inverse of this string, swapping the original and modified strings.
@@ -492,6 +603,20 @@ class bistr:
         pad = width - len(self)
         return bistr('', fillchar * pad) + self
 
+    def pipe(self, *steps: Callable[[bistr], bistr]) -> bistr:
+        """
+        Apply a sequence of transformations, composing their alignments only once at the end.
+
+            >>> from operator import methodcaller
+            >>> bistr('  Hello,   WORLD  ').pipe(bistr.strip, bistr.lower, methodcaller('replace', '   ', ' '))
+            bistr('  Hello,   WORLD  ', 'hello, world', Alignment([(0, 0), (2, 0), (3, 1), (4, 2), (5, 3), (6, 4), (7, 5), (8, 6), (11, 7), (12, 8), (13, 9), (14, 10), (15, 11), (16, 12), (18, 12)]))
+
+        See :class:`Pipeline` for details, and to reuse the same sequence of steps for many strings.
+        """
+
+        from ._pipeline import Pipeline
+        return Pipeline(*steps)(self)
+
     def _builder(self) -> BistrBuilder:
         from ._builder import BistrBuilder
         return BistrBuilder(self)
@@ -570,20 +695,8 @@ class bistr:
             bistr('ἴΣ', 'Ἴς', Alignment.identity(2))
         """
 
-        # We have to be careful here to get context-sensitive letters like
-        # word-final sigma correct
-
-        builder = self._builder()
-
-        title = bistr(self.modified).title()
-        for chunk in islice(title.chunks(), 1):
-            builder.replace(len(chunk.original), chunk.modified)
-
-        lower = bistr(self.modified).lower()
-        for chunk in islice(lower.chunks(), 1, None):
-            builder.replace(len(chunk.original), chunk.modified)
-
-        return builder.build()
+        from ._icu import capitalize
+        return capitalize(self, locale)
 
     def swapcase(self, locale: Optional[str] = None) -> bistr:
         """
@@ -607,27 +720,8 @@ class bistr:
             ('ǈepòta' ⇋ 'lJEPÒTA')
         """
 
-        builder = self._builder()
-
-        lower = bistr(self.modified).lower(locale)
-        upper = bistr(self.modified).upper(locale)
-
-        while not builder.is_complete:
-            i = builder.position
-            c = self[i]
-            cat = unicodedata.category(c)
-            if cat == 'Ll':
-                repl = upper
-            elif cat == 'Lu':
-                repl = lower
-            else:
-                builder.skip(1)
-                continue
-
-            chunk = repl[repl.alignment.modified_slice(i, i + 1)]
-            builder.append(chunk)
-
-        return builder.build()
+        from ._icu import swapcase
+        return swapcase(self, locale)
 
 
     def expandtabs(self, tabsize: int = 8) -> bistr:
@@ -653,6 +747,60 @@ class bistr:
 
         return builder.build()
 
+    maketrans = staticmethod(str.maketrans)
+
+    def translate(self, table: TranslationTable) -> bistr:
+        """
+        Like :meth:`str.translate`, maps each character through a translation table, like those made by
+        :meth:`maketrans`.  Characters can be mapped to strings, code points, or ``None`` to delete them.  Like
+        :meth:`str.translate`, the table only needs to support indexing, and characters it raises :class:`LookupError`
+        for are left alone.
+
+            >>> s = bistr('“Hi,” she said…').translate(bistr.maketrans({'“': '"', '”': '"', '…': '...', ',': None}))
+            >>> s.modified
+            '"Hi" she said...'
+            >>> s[13:16]
+            bistr('…', '...')
+
+        Only the characters that the table changes are visited, so translating a string that the table doesn't touch
+        costs about as much as a single :meth:`str.translate` call.
+        """
+
+        modified = self.modified
+        if modified.translate(table) == modified:
+            return self
+
+        # Mappings can be scanned directly, but other tables can only be queried for the characters we have
+        if isinstance(table, Mapping):
+            # str.translate() only ever looks up code points, so it ignores any other keys
+            chars: Iterable[str] = (chr(key) for key in table.keys() if isinstance(key, int) and 0 <= key < 0x110000)
+        else:
+            chars = set(modified)
+
+        changes: Dict[str, str] = {}
+        for c in chars:
+            try:
+                value = table[ord(c)]
+            except LookupError:
+                continue
+            if value is None:
+                changes[c] = ''
+            elif isinstance(value, int):
+                changes[c] = chr(value)
+            else:
+                changes[c] = value
+        changed = [c for c, value in changes.items() if value != c]
+        pattern = re.compile('[' + ''.join(map(re.escape, changed)) + ']')
+
+        def edits() -> Iterator[Edit]:
+            for match in pattern.finditer(modified):
+                i = match.start()
+                yield i, i + 1, changes[match.group()]
+
+        builder = self._builder()
+        builder.apply_edits(edits())
+        return builder.build()
+
     def replace(self, old: str, new: str, count: Optional[int] = None) -> bistr:
         """
         Like :meth:`str.replace`, replaces occurrences of `old` with `new`.
@@ -691,6 +839,60 @@ class bistr:
         builder.replace_all(regex, repl)
         return builder.build()
 
+    def replace_many(self, replacements: Union[Mapping[str, str], Replacer]) -> bistr:
+        """
+        Replace all occurrences of many substrings at once, in a single pass.
+
+            >>> bistr('I <3 NY').replace_many({'<3': 'love', 'NY': 'New York', 'N': 'n'})
+            bistr('I <3 NY', 'I love New York', Alignment([(0, 0), (1, 1), (2, 2), (4, 6), (5, 7), (7, 15)]))
+
+        :param replacements:
+            A mapping from substrings to their replacements, or a pre-compiled :class:`Replacer` to reuse across many
+            strings.  Where matches overlap, the leftmost one wins, then the longest.
+        """
+
+        builder = self._builder()
+        builder.replace_many(replacements)
+        return builder.build()
+
+    def apply_edits(self, edits: Iterable[Edit], *, sort: bool = False) -> bistr:
+        """
+        Apply a list of ``(start, end, replacement)`` edits to the modified string in a single pass.
+
+            >>> bistr('Call me at 555-0123, Ishmael').apply_edits([(21, 28, '<NAME>'), (11, 19, '<PHONE>')], sort=True)[11:]
+            bistr('555-0123, Ishmael', '<PHONE>, <NAME>', Alignment([(0, 0), (8, 7), (9, 8), (10, 9), (17, 15)]))
+
+        :param edits:
+            The edits to apply.  `start` and `end` are positions in the modified string.  The edits must be sorted and
+            may not overlap.
+        :param sort:
+            Whether to sort the edits by position first.
+        :raises:
+            :class:`ValueError` if the edits overlap or are out of order, and :class:`IndexError` if they extend past
+            the end of the string.
+        """
+
+        builder = self._builder()
+        builder.apply_edits(edits, sort=sort)
+        return builder.build()
+
+    def sub_all(self, rules: Union[Iterable[Tuple[Regex, Replacement]], RewriteRules]) -> bistr:
+        r"""
+        Like :meth:`sub`, but applies many regex substitution rules at once, in a single pass.
+
+            >>> bistr('Up  50% in\t2019').sub_all([(r'\s+', ' '), (r'(\d+)%', r'\1 percent'), (r'\d+', '#')])
+            bistr('Up  50% in\t2019', 'Up 50 percent in #', Alignment([(0, 0), (1, 1), (2, 2), (4, 3), (7, 13), (8, 14), (9, 15), (10, 16), (11, 17), (15, 18)]))
+
+        :param rules:
+            The ``(regex, replacement)`` rules to apply, in order of priority, or pre-compiled :class:`RewriteRules` to
+            reuse across many strings.  At each position, the first matching rule wins.  Unlike a sequence of
+            :meth:`sub` calls, the output of one rule is never seen by later ones.
+        """
+
+        builder = self._builder()
+        builder.replace_all_rules(rules)
+        return builder.build()
+
     def _should_strip(self, c: str, chars: Optional[str]) -> bool:
         if chars is None:
             return c.isspace()
@@ -767,3 +969,5 @@ String = Union[str, bistr]
 
 if TYPE_CHECKING:
     from ._builder import BistrBuilder
+    from ._cache import InferCache
+    from ._replace import Replacer, RewriteRules
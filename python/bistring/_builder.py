@@ -3,12 +3,14 @@
 
 __all__ = ['BistrBuilder']
 
-from typing import Iterable, List, Match, Optional
+from operator import itemgetter
+from typing import Iterable, List, Mapping, Match, Optional, Tuple, Union
 
-from ._alignment import Alignment
+from ._alignment import Alignment, _get_storage, _Runs
 from ._bistr import bistr, String
 from ._regex import compile_regex, expand_template
-from ._typing import BiIndex, Regex, Replacement
+from ._replace import Replacer, RewriteRules
+from ._typing import Edit, Regex, Replacement
 
 
 class BistrBuilder:
@@ -57,7 +59,7 @@ class BistrBuilder:
 
     _original: bistr
     _modified: List[str]
-    _alignment: List[BiIndex]
+    _alignment: _Runs
     _opos: int
     _mpos: int
 
@@ -68,8 +70,12 @@ class BistrBuilder:
         """
 
         self._original = bistr(original)
+        self._reset()
+
+    def _reset(self) -> None:
         self._modified = []
-        self._alignment = [(0, 0)]
+        self._alignment = _Runs(_get_storage(None))
+        self._alignment.append(0, 0)
         self._opos = 0
         self._mpos = 0
 
@@ -99,7 +105,7 @@ class BistrBuilder:
         """
         The alignment built so far from self.current to self.modified.
         """
-        return Alignment(self._alignment)
+        return Alignment._from_runs(self._alignment.copy())
 
     @property
     def position(self) -> int:
@@ -133,7 +139,7 @@ class BistrBuilder:
         self._opos += ocount
         self._mpos += mcount
         if ocount > 0 or mcount > 0:
-            self._alignment.append((self._opos, self._mpos))
+            self._alignment.append(self._opos, self._mpos)
 
     def skip(self, n: int) -> None:
         """
@@ -141,8 +147,9 @@ class BistrBuilder:
         """
         if n > 0:
             self._modified.append(self.peek(n))
-            for i in range(n):
-                self._advance(1, 1)
+            self._alignment.append_run(self._opos, self._mpos, n)
+            self._opos += n
+            self._mpos += n
 
     def skip_rest(self) -> None:
         """
@@ -183,8 +190,11 @@ class BistrBuilder:
         if bs.original != self.peek(len(bs.original)):
             raise ValueError("bistr doesn't match the current string")
         self._modified.append(bs.modified)
-        for (o0, m0), (o1, m1) in zip(bs.alignment, bs.alignment[1:]):
-            self._advance(o1 - o0, m1 - m0)
+        alignment = bs.alignment
+        for o, m, n in zip(alignment._original, alignment._modified, alignment._lengths):
+            self._alignment.append_run(self._opos + o, self._mpos + m, n)
+        self._opos += len(bs.original)
+        self._mpos += len(bs.modified)
 
     def _match(self, regex: Regex) -> Optional[Match[str]]:
         pattern = compile_regex(regex)
@@ -287,6 +297,102 @@ class BistrBuilder:
             self.replace(match.end() - match.start(), expand_template(match, repl))
         self.skip_rest()
 
+    def apply_edits(self, edits: Iterable[Edit], *, sort: bool = False) -> None:
+        """
+        Apply a list of edits in a single pass, copying everything between them unchanged.
+
+            >>> b = BistrBuilder('Call me at 555-0123, Ishmael')
+            >>> b.apply_edits([(11, 19, '<PHONE>'), (21, 28, '<NAME>')])
+            >>> s = b.build()
+            >>> s.modified
+            'Call me at <PHONE>, <NAME>'
+            >>> s[11:18]
+            bistr('555-0123', '<PHONE>')
+
+        :param edits:
+            The edits to apply, as ``(start, end, replacement)`` tuples.  `start` and `end` are positions in the current
+            string, at or after the current :attr:`position`.  The edits must be sorted and may not overlap, though
+            insertions (``start == end``) may touch their neighbours.
+        :param sort:
+            Whether to sort the edits by position first.  Edits with the same bounds keep their relative order.
+        :raises:
+            :class:`ValueError` if the edits overlap or are out of order, and :class:`IndexError` if they extend past
+            the end of the string.  Any edits before the invalid one will have been applied.
+        """
+
+        if sort:
+            edits = sorted(edits, key=itemgetter(0, 1))
+
+        current = self.current
+        length = len(current)
+        append = self._modified.append
+        append_pair = self._alignment.append
+        append_run = self._alignment.append_run
+        opos, mpos = self._opos, self._mpos
+
+        try:
+            for start, end, repl in edits:
+                if start < opos:
+                    raise ValueError(f'Edit ({start}, {end}) overlaps or precedes the previous edit')
+                elif end < start:
+                    raise ValueError(f'Edit ({start}, {end}) ends before it starts')
+                elif end > length:
+                    raise IndexError(f'Edit ({start}, {end}) extends past the end of the string')
+
+                n = start - opos
+                if n > 0:
+                    append(current[opos:start])
+                    append_run(opos, mpos, n)
+                    mpos += n
+
+                if repl:
+                    append(repl)
+                opos = end
+                mpos += len(repl)
+                append_pair(opos, mpos)
+        finally:
+            self._opos, self._mpos = opos, mpos
+
+        self.skip_rest()
+
+    def replace_all_rules(self, rules: Union[Iterable[Tuple[Regex, Replacement]], RewriteRules]) -> None:
+        r"""
+        Apply many regex substitution rules at once, in a single pass.
+
+            >>> b = BistrBuilder('Up  50% in\t2019')
+            >>> b.replace_all_rules([(r'\s+', ' '), (r'(\d+)%', r'\1 percent'), (r'\d+', '#')])
+            >>> b.build().modified
+            'Up 50 percent in #'
+
+        :param rules:
+            The ``(regex, replacement)`` rules to apply, in order of priority, or pre-compiled :class:`RewriteRules`.
+            At each position, the first matching rule wins.
+        """
+
+        if not isinstance(rules, RewriteRules):
+            rules = RewriteRules(rules)
+
+        self.apply_edits(rules.edits(self.current, self._opos))
+
+    def replace_many(self, replacements: Union[Mapping[str, str], Replacer]) -> None:
+        """
+        Replace all occurrences of many substrings at once, in a single pass.
+
+            >>> b = BistrBuilder('I <3 NY')
+            >>> b.replace_many({'<3': 'love', 'NY': 'New York', 'N': 'n'})
+            >>> b.build().modified
+            'I love New York'
+
+        :param replacements:
+            A mapping from substrings to their replacements, or a pre-compiled :class:`Replacer`.  Where matches
+            overlap, the leftmost one wins, then the longest.
+        """
+
+        if not isinstance(replacements, Replacer):
+            replacements = Replacer(replacements)
+
+        self.apply_edits(replacements.edits(self.current, self._opos))
+
     def build(self) -> bistr:
         """
         Build the `bistr`.
@@ -311,7 +417,4 @@ class BistrBuilder:
             :class:`ValueError` if the modified string is not completely built yet.
         """
         self._original = self.build()
-        self._modified = []
-        self._alignment = [(0, 0)]
-        self._opos = 0
-        self._mpos = 0
+        self._reset()
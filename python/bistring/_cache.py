@@ -0,0 +1,239 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from __future__ import annotations
+
+__all__ = ['InferCache']
+
+from array import array
+from functools import partial
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import types
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+import zlib
+
+from ._alignment import Alignment, _get_storage
+
+
+_VERSION = b'bistring.InferCache/2'
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS alignments (
+    key BLOB PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alignments_used ON alignments (used);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, (SELECT TOTAL(size) FROM alignments));
+'''
+
+
+class InferCache:
+    """
+    A persistent cache of inferred alignments, stored in a local SQLite database.
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'alignments.db')
+        >>> cache = InferCache(path)
+        >>> Alignment.infer('color', 'colour', cache=cache)
+        Alignment([(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (4, 5), (5, 6)])
+        >>> len(cache)
+        1
+
+    Alignments are keyed by a hash of both sequences, the cost function's qualified name, and the options that affect
+    the result.  Only strings and sequences of :class:`str`, :class:`int`, or :class:`bytes` can be cached, and only
+    named cost functions, since the name of a lambda, a bound method, or a :func:`functools.partial` doesn't determine
+    its costs.  Using those raises a :class:`ValueError`, unless you pass a `cache_key` to :meth:`Alignment.infer` that
+    identifies the costs instead:
+
+        >>> from functools import partial
+        >>> def weighted_cost(weight, a, b):
+        ...     return 0 if a == b else weight
+        >>> Alignment.infer('color', 'colour', partial(weighted_cost, 2), cache=cache, cache_key='weighted_cost(2)')
+        Alignment([(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (4, 5), (5, 6)])
+
+    The database can be shared by multiple threads and processes on the same host, and the least recently used
+    alignments are evicted once it grows past `max_size` bytes.  Pickling an `InferCache` (e.g. to send it to worker
+    processes) produces a new connection to the same database.
+    """
+
+    _path: str
+    _max_size: int
+    _local: threading.local
+
+    def __init__(self, path: Union[str, os.PathLike[str]], max_size: int = 1 << 30):
+        """
+        :param path:
+            The path to the database file, which is created if it doesn't exist.
+        :param max_size:
+            The maximum total size in bytes of the cached alignments.
+        """
+
+        if max_size < 0:
+            raise ValueError('max_size must be non-negative')
+
+        self._path = os.fspath(path)
+        self._max_size = max_size
+        self._local = threading.local()
+
+        # Create the database eagerly, so errors are reported here
+        self._connection()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (InferCache, (self._path, self._max_size))
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections can't be shared between threads, or survive a fork
+        pid = os.getpid()
+        conn: Optional[sqlite3.Connection] = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != pid:
+            conn = sqlite3.connect(self._path, timeout=60, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = pid
+        return conn
+
+    def __len__(self) -> int:
+        """
+        The number of cached alignments.
+        """
+        row = self._connection().execute('SELECT COUNT(*) FROM alignments').fetchone()
+        return int(row[0])
+
+    def clear(self) -> None:
+        """
+        Remove all the cached alignments.
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM alignments')
+            conn.execute('UPDATE totals SET size = 0')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def close(self) -> None:
+        """
+        Close this thread's connection to the database.  It will be reopened if the cache is used again.
+        """
+        conn: Optional[sqlite3.Connection] = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            del self._local.conn
+
+    def _key(self, kind: str, original: Sequence[Any], modified: Sequence[Any], cost_fn: Optional[Callable[..., Any]], cost_key: Optional[str], *options: Any) -> bytes:
+        if cost_key is not None:
+            cost_id = f'key:{cost_key}'
+        elif cost_fn is None:
+            cost_id = ''
+        else:
+            # Bound methods and partials share a name with differently configured instances
+            bound = getattr(cost_fn, '__self__', None)
+            if isinstance(cost_fn, partial) or (bound is not None and not isinstance(bound, types.ModuleType)):
+                raise ValueError(f'Cannot cache alignments for the cost function {cost_fn!r} without a cache_key')
+
+            module = getattr(cost_fn, '__module__', None)
+            name = getattr(cost_fn, '__qualname__', None)
+            if not module or not name or '<' in name:
+                raise ValueError(f'Cannot cache alignments for an anonymous cost function {cost_fn!r} without a cache_key')
+
+            cost_id = f'{module}.{name}'
+
+        digest = hashlib.sha256(_VERSION)
+        for part in (kind.encode(), cost_id.encode(), repr(options).encode(), _encode(original), _encode(modified)):
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.digest()
+
+    def _get(self, key: bytes) -> Optional[Alignment]:
+        conn = self._connection()
+        row = conn.execute('SELECT data FROM alignments WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        conn.execute('UPDATE alignments SET used = ? WHERE key = ?', (time.time(), key))
+        return _decode(row[0])
+
+    def _put(self, key: bytes, alignment: Alignment) -> None:
+        data = _serialize(alignment)
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Keep a running total of the size, so we don't have to scan the whole table every time
+            row = conn.execute('SELECT size FROM alignments WHERE key = ?', (key,)).fetchone()
+            delta = len(data) - (row[0] if row else 0)
+            conn.execute('INSERT OR REPLACE INTO alignments VALUES (?, ?, ?, ?)', (key, data, len(data), time.time()))
+            conn.execute('UPDATE totals SET size = size + ?', (delta,))
+            total = conn.execute('SELECT size FROM totals').fetchone()[0]
+
+            if total > self._max_size:
+                evicted = []
+                for old_key, size in conn.execute('SELECT key, size FROM alignments ORDER BY used'):
+                    if total <= self._max_size:
+                        break
+                    evicted.append((old_key,))
+                    total -= size
+                conn.executemany('DELETE FROM alignments WHERE key = ?', evicted)
+                conn.execute('UPDATE totals SET size = ?', (total,))
+
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _infer(self, kind: str, original: Sequence[Any], modified: Sequence[Any], cost_fn: Optional[Callable[..., Any]], cost_key: Optional[str], options: Tuple[Any, ...], infer: Callable[[], Alignment]) -> Alignment:
+        key = self._key(kind, original, modified, cost_fn, cost_key, *options)
+        result = self._get(key)
+        if result is None:
+            result = infer()
+            self._put(key, result)
+        return result
+
+
+def _encode(seq: Sequence[Any]) -> bytes:
+    if isinstance(seq, str):
+        return b's' + seq.encode('utf-8', 'surrogatepass')
+
+    # Other reprs aren't reliable keys, e.g. object() includes its address
+    parts = [b'l']
+    for item in seq:
+        if isinstance(item, str):
+            data = b's' + item.encode('utf-8', 'surrogatepass')
+        elif isinstance(item, bytes):
+            data = b'b' + item
+        elif isinstance(item, int):
+            data = b'i' + item.to_bytes(item.bit_length() // 8 + 1, 'little', signed=True)
+        else:
+            raise TypeError(f'Cannot cache alignments for sequences of {type(item).__name__}')
+        parts.append(len(data).to_bytes(8, 'little'))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def _serialize(alignment: Alignment) -> bytes:
+    runs = array('q', alignment._original)
+    runs.extend(alignment._modified)
+    runs.extend(alignment._lengths)
+    return zlib.compress(runs.tobytes())
+
+
+def _decode(data: bytes) -> Alignment:
+    runs = array('q')
+    runs.frombytes(zlib.decompress(data))
+    n = len(runs) // 3
+    storage = _get_storage(None)
+    return Alignment._create(storage(runs[:n]), storage(runs[n:2*n]), storage(runs[2*n:]))
@@ -1,43 +1,158 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT license.
 
+from functools import lru_cache
+import heapq
 import icu
-from typing import Callable, Optional
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+import unicodedata
 
 from ._bistr import bistr
 from ._builder import BistrBuilder
+from ._typing import Edit
 
 
-def _edit(bs: bistr, op: Callable, locale: Optional[str] = None) -> bistr:
-    builder = BistrBuilder(bs)
+# Locales and normalizers are immutable and thread-safe, so they're shared by the whole process
+
+@lru_cache(maxsize=None)
+def _get_locale(name: str) -> icu.Locale:
+    return icu.Locale(name)
+
+
+@lru_cache(maxsize=None)
+def _get_language(name: str) -> str:
+    return _get_locale(name).getLanguage()
+
+
+# BreakIterators are stateful, so each thread gets its own, shared by all the tokenizers for the same locale
+
+_BreakIteratorFactory = Callable[[icu.Locale], icu.BreakIterator]
+
+_local = threading.local()
+
+
+def _get_break_iterator(constructor: _BreakIteratorFactory, locale: str) -> icu.BreakIterator:
+    cache: Optional[Dict[Tuple[_BreakIteratorFactory, str], icu.BreakIterator]]
+    cache = getattr(_local, 'break_iterators', None)
+    if cache is None:
+        cache = _local.break_iterators = {}
+
+    key = (constructor, locale)
+    bi = cache.get(key)
+    if bi is None:
+        bi = constructor(_get_locale(locale))
+        cache[key] = bi
+    return bi
+
+
+def _utf16_offsets(text: str) -> List[int]:
+    """
+    Map each UTF-16 code unit offset in `text` to its code point offset.
+    """
+
+    offsets = []
+    for i, c in enumerate(text):
+        offsets.append(i)
+        if c > '\uFFFF':
+            offsets.append(i)
+    offsets.append(len(text))
+    return offsets
+
+
+def _changes(current: str, op: Callable, locale: Optional[str] = None) -> List[Edit]:
+    """
+    Apply an ICU case mapping to a string, and return its changes as edits suitable for
+    :meth:`BistrBuilder.apply_edits`.
+    """
+
     edits = icu.Edits()
-    ucur = icu.UnicodeString(builder.current)
+    ucur = icu.UnicodeString(current)
 
     if locale is None:
-        umod = icu.UnicodeString(op(ucur, edits))
+        modified = op(ucur, edits)
     else:
-        umod = icu.UnicodeString(op(icu.Locale(locale), ucur, edits))
+        modified = op(_get_locale(locale), ucur, edits)
 
-    for is_change, old_len, new_len, old_i, new_i, _ in edits.getFineIterator():
-        old_len = ucur.countChar32(old_i, old_len)
-        if is_change:
-            repl = str(umod[new_i:new_i+new_len])
-            builder.replace(old_len, repl)
-        else:
-            builder.skip(old_len)
+    if not edits.hasChanges():
+        return []
+
+    # ICU reports UTF-16 offsets, which only need translating if there are any astral characters
+    if len(ucur) == len(current):
+        cur_offsets = None
+    else:
+        cur_offsets = _utf16_offsets(current)
+
+    if len(modified) == len(icu.UnicodeString(modified)):
+        mod_offsets = None
+    else:
+        mod_offsets = _utf16_offsets(modified)
+
+    # Only visit the changes, but one character at a time to keep the alignment fine-grained
+    changes = []
+    for _, old_len, new_len, old_i, new_i, _ in edits.getFineChangesIterator():
+        old_j = old_i + old_len
+        new_j = new_i + new_len
+        if cur_offsets:
+            old_i = cur_offsets[old_i]
+            old_j = cur_offsets[old_j]
+        if mod_offsets:
+            new_i = mod_offsets[new_i]
+            new_j = mod_offsets[new_j]
+        changes.append((old_i, old_j, modified[new_i:new_j]))
+
+    return changes
 
+
+def _edit(bs: bistr, op: Callable, locale: Optional[str] = None) -> bistr:
+    changes = _changes(bs.modified, op, locale)
+    if not changes:
+        return bs
+
+    builder = BistrBuilder(bs)
+    builder.apply_edits(changes)
     return builder.build()
 
 
+_SPECIAL_CASING = {'az', 'lt', 'tr'}
+"""
+Languages with locale-specific case mappings that affect ASCII letters (the Turkic dotted and dotless i), or that may
+be combined with them (Lithuanian dot above).
+"""
+
+
+def _has_ascii_casing(locale: Optional[str]) -> bool:
+    if locale is None:
+        language = icu.Locale.getDefault().getLanguage()
+    else:
+        language = _get_language(locale)
+    return language not in _SPECIAL_CASING
+
+
+def _ascii_edit(bs: bistr, op: Callable[[str], str]) -> bistr:
+    # ASCII case mappings are always one-to-one, so the alignment doesn't change
+    modified = op(bs.modified)
+    if modified == bs.modified:
+        return bs
+    else:
+        return bistr(bs.original, modified, bs.alignment)
+
+
 def casefold(bs: bistr) -> bistr:
+    if bs.modified.isascii():
+        return _ascii_edit(bs, str.casefold)
     return _edit(bs, icu.CaseMap.fold)
 
 
 def lower(bs: bistr, locale: Optional[str]) -> bistr:
+    if bs.modified.isascii() and _has_ascii_casing(locale):
+        return _ascii_edit(bs, str.lower)
     return _edit(bs, icu.CaseMap.toLower, locale)
 
 
 def upper(bs: bistr, locale: Optional[str]) -> bistr:
+    if bs.modified.isascii() and _has_ascii_casing(locale):
+        return _ascii_edit(bs, str.upper)
     return _edit(bs, icu.CaseMap.toUpper, locale)
 
 
@@ -45,11 +160,99 @@ def title(bs: bistr, locale: Optional[str]) -> bistr:
     return _edit(bs, icu.CaseMap.toTitle, locale)
 
 
+def capitalize(bs: bistr, locale: Optional[str]) -> bistr:
+    current = bs.modified
+    if current.isascii() and _has_ascii_casing(locale):
+        return _ascii_edit(bs, str.capitalize)
+
+    # Title-case the first character, and lowercase the rest.  Both are computed on the whole string, to get
+    # context-sensitive letters like word-final sigma right.
+    edits = _changes(current, icu.CaseMap.toTitle, locale)[:1]
+    if edits and edits[0][0] == 0:
+        end = edits[0][1]
+    else:
+        edits = []
+        end = 1
+
+    edits.extend(edit for edit in _changes(current, icu.CaseMap.toLower, locale) if edit[0] >= end)
+    if not edits:
+        return bs
+
+    builder = BistrBuilder(bs)
+    builder.apply_edits(edits)
+    return builder.build()
+
+
+def swapcase(bs: bistr, locale: Optional[str]) -> bistr:
+    current = bs.modified
+    if current.isascii() and _has_ascii_casing(locale):
+        return _ascii_edit(bs, str.swapcase)
+
+    # Uppercase the lowercase letters and vice versa, leaving everything else (including title-case letters) alone
+    category = unicodedata.category
+    upper = (edit for edit in _changes(current, icu.CaseMap.toUpper, locale) if category(current[edit[0]]) == 'Ll')
+    lower = (edit for edit in _changes(current, icu.CaseMap.toLower, locale) if category(current[edit[0]]) == 'Lu')
+    edits = list(heapq.merge(upper, lower))
+    if not edits:
+        return bs
+
+    builder = BistrBuilder(bs)
+    builder.apply_edits(edits)
+    return builder.build()
+
+
+def _normalized_span(normalizer: icu.Normalizer2, current: str, pos: int, window: int) -> Tuple[int, int]:
+    """
+    Find the end of the already-normalized text that starts at `pos`, backed off to a normalization boundary so that
+    the rest can be processed one chunk at a time.  Returns the end and the window size to use next time, which grows
+    over long normalized stretches and shrinks in text that needs a lot of changes.
+    """
+
+    length = len(current)
+    while True:
+        end = min(pos + window, length)
+        chunk = icu.UnicodeString(current[pos:end])
+        span = normalizer.spanQuickCheckYes(chunk)
+        if span < len(chunk):
+            end = pos + chunk.countChar32(0, span)
+            window = max(window // 2, 8)
+        elif end == length:
+            return end, window
+        else:
+            window *= 2
+
+        # The next character may still interact with the text before it
+        while end > pos and not normalizer.hasBoundaryBefore(current[end]):
+            end -= 1
+
+        if end > pos or span < len(chunk):
+            return end, window
+
+
 def _normalize(normalizer: icu.Normalizer2, bs: bistr) -> bistr:
     builder = BistrBuilder(bs)
     current = builder.current
+    window = 64
+    misses = 0
+    countdown = 0
+
+    while True:
+        if countdown > 0:
+            countdown -= 1
+        else:
+            # Skip over text that's already normalized in bulk
+            end, window = _normalized_span(normalizer, current, builder.position, window)
+            if end > builder.position:
+                builder.skip(end - builder.position)
+                misses = 0
+            else:
+                # Back off exponentially in text that needs a lot of changes
+                misses += 1
+                countdown = min(1 << misses, 64)
+
+        if builder.is_complete:
+            break
 
-    while not builder.is_complete:
         i = builder.position
         j = i + 1
         while j < len(current) and not normalizer.hasBoundaryBefore(current[j]):
@@ -72,9 +275,14 @@ _NORMALIZERS = {
     'NFKD': icu.Normalizer2.getNFKDInstance,
 }
 
-def normalize(bs: bistr, form: str) -> bistr:
+@lru_cache(maxsize=None)
+def _get_normalizer(form: str) -> icu.Normalizer2:
     factory = _NORMALIZERS.get(form)
     if factory:
-        return _normalize(factory(), bs)
+        return factory()
     else:
         raise ValueError('invalid normalization form')
+
+
+def normalize(bs: bistr, form: str) -> bistr:
+    return _normalize(_get_normalizer(form), bs)
@@ -3,15 +3,20 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Union
 import unicodedata
 
 from ._alignment import Alignment
 from ._bistr import bistr
+from ._cache import InferCache
 from ._token import CharacterTokenizer
 
 
+Real = Union[int, float]
+
+
 @dataclass(frozen=True)
 class AugmentedChar:
     """
@@ -120,17 +125,27 @@ class AugmentedString:
         return cls(original, chars, alignment)
 
 
-def heuristic_infer(original: str, modified: str) -> bistr:
+def heuristic_infer(original: str, modified: str, *, max_distance: Optional[Real] = None, anchor: bool = False, workers: Optional[int] = None, executor: Optional[Executor] = None, cache: Optional[InferCache] = None) -> bistr:
     """
     Infer the alignment between two strings with a "smart" heuristic.
 
     We use Unicode normalization and case folding to minimize differences that are due to case, accents, ligatures, etc.
     """
 
+    if cache is not None:
+        alignment = cache._infer(
+            'heuristic_infer', original, modified, None, None, (max_distance, anchor),
+            lambda: heuristic_infer(original, modified, max_distance=max_distance, anchor=anchor, workers=workers, executor=executor).alignment,
+        )
+        return bistr(original, modified, alignment)
+
     aug_orig = AugmentedString.augment(original)
     aug_mod = AugmentedString.augment(modified)
 
-    alignment = Alignment.infer(aug_orig.chars, aug_mod.chars, AugmentedChar.cost_fn)
+    alignment = Alignment.infer(
+        aug_orig.chars, aug_mod.chars, AugmentedChar.cost_fn,
+        max_distance=max_distance, anchor=anchor, workers=workers, executor=executor,
+    )
     alignment = aug_orig.alignment.compose(alignment)
     alignment = alignment.compose(aug_mod.alignment.inverse())
 
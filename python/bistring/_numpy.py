@@ -0,0 +1,22 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from functools import lru_cache
+from typing import Any
+
+
+@lru_cache(maxsize=None)
+def import_numpy() -> Any:
+    """
+    Import NumPy, which is an optional dependency.
+
+    :returns:
+        The `numpy` module, or ``None`` if it isn't installed.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    else:
+        return numpy
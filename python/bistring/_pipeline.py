@@ -0,0 +1,245 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from __future__ import annotations
+
+__all__ = ['CacheInfo', 'Pipeline', 'TransformCache']
+
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional, Tuple
+
+from ._alignment import Alignment
+from ._bistr import bistr, String
+
+
+Step = Callable[[bistr], bistr]
+
+
+class Pipeline:
+    """
+    A reusable sequence of transformations, applied one after another.
+
+        >>> from operator import methodcaller
+        >>> normalize = Pipeline(
+        ...     methodcaller('normalize', 'NFKD'),
+        ...     bistr.casefold,
+        ...     methodcaller('sub', r'\\s+', ' '),
+        ...     bistr.strip,
+        ... )
+        >>> s = normalize('  𝕳𝖊𝖑𝖑𝖔,\\t𝖜𝖔𝖗𝖑𝖉!  ')
+        >>> s.modified
+        'hello, world!'
+        >>> s[7:12]
+        bistr('𝖜𝖔𝖗𝖑𝖉', 'world', Alignment.identity(5))
+
+    Each step runs on a fresh `bistr` of the previous step's output, so it only builds the alignment for its own
+    changes.  The alignments of all the steps are composed once at the end, rather than once per step as in a chain
+    of method calls.  A pipeline can be pickled to send it to worker processes, as long as its steps can be (e.g.
+    :func:`operator.methodcaller` objects and :class:`bistr` methods, rather than lambdas).
+    """
+
+    _steps: Tuple[Step, ...]
+    _cache: Optional[TransformCache]
+
+    def __init__(self, *steps: Step, cache: Optional[TransformCache] = None):
+        """
+        :param steps:
+            The transformations to apply, in order.  Each one takes a `bistr` and returns a transformed `bistr` with
+            the same original string.
+        :param cache:
+            A cache to remember the results of this pipeline for repeated strings (see :class:`TransformCache`).
+        """
+        self._steps = steps
+        self._cache = cache
+
+    def __call__(self, text: String) -> bistr:
+        """
+        Apply this pipeline to a string.
+        """
+
+        if self._cache is None:
+            return self._apply(bistr(text))
+        else:
+            return self._cache.apply(text, self._apply)
+
+    def _apply(self, text: bistr) -> bistr:
+        current = text.modified
+        alignments = []
+        for step in self._steps:
+            result = _check(step, step(bistr(current)), current)
+            current = result.modified
+            alignments.append(result.alignment)
+
+        if alignments:
+            return bistr(text.original, current, text.alignment.compose(_compose_all(alignments)))
+        else:
+            return text
+
+
+def _check(step: Step, result: bistr, current: str) -> bistr:
+    if result.original is not current and result.original != current:
+        raise ValueError(f'Transformation {step!r} changed the original string')
+    return result
+
+
+def _compose_all(alignments: List[Alignment]) -> Alignment:
+    """
+    Compose a chain of alignments pairwise, so the long accumulated alignment isn't walked once per step.
+    """
+
+    while len(alignments) > 1:
+        pairs = [a.compose(b) for a, b in zip(alignments[::2], alignments[1::2])]
+        if len(alignments) % 2:
+            pairs.append(alignments[-1])
+        alignments = pairs
+
+    return alignments[0]
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics about a :class:`TransformCache`.
+    """
+
+    hits: int
+    """
+    The number of lookups that found a cached result.
+    """
+
+    misses: int
+    """
+    The number of lookups that had to compute the result.
+    """
+
+    evictions: int
+    """
+    The number of results that were dropped to make room for newer ones.
+    """
+
+    maxsize: int
+    """
+    The maximum number of results to keep.
+    """
+
+    currsize: int
+    """
+    The number of results currently cached.
+    """
+
+
+class TransformCache:
+    """
+    A bounded, least-recently-used cache of the results of transforming strings.
+
+        >>> from operator import methodcaller
+        >>> cache = TransformCache(1000)
+        >>> nfkc = methodcaller('normalize', 'NFKC')
+        >>> cache.apply(bistr('ﬁne'), nfkc)
+        bistr('ﬁne', 'fine', Alignment([(0, 0), (1, 2), (2, 3), (3, 4)]))
+        >>> cache.apply(bistr('ﬁne').upper(), nfkc)
+        bistr('ﬁne', 'FINE', Alignment([(0, 0), (1, 2), (2, 3), (3, 4)]))
+        >>> cache.cache_info()
+        CacheInfo(hits=0, misses=2, evictions=0, maxsize=1000, currsize=2)
+        >>> cache.apply('ﬁne', nfkc)
+        bistr('ﬁne', 'fine', Alignment([(0, 0), (1, 2), (2, 3), (3, 4)]))
+        >>> cache.cache_info()
+        CacheInfo(hits=1, misses=2, evictions=0, maxsize=1000, currsize=2)
+
+    Results are cached by the transformation and the modified string alone, and only the alignment of the change
+    itself is stored.  It's then composed with the alignment of each input, so a cached result can be reused for any
+    `bistr` with the same modified string.  This means the transformations must only depend on :attr:`bistr.modified`,
+    which is true of all the :class:`bistr` methods.
+
+    A `TransformCache` is safe to share between threads.  Pickling one (e.g. as part of a :class:`Pipeline`) produces
+    an empty cache of the same size.
+    """
+
+    _maxsize: int
+    _entries: OrderedDict[Hashable, Tuple[str, Alignment]]
+    _lock: threading.Lock
+    _hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        :param maxsize:
+            The maximum number of results to keep.
+        """
+
+        if maxsize < 0:
+            raise ValueError('maxsize must be non-negative')
+
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (TransformCache, (self._maxsize,))
+
+    def apply(self, text: String, transform: Step) -> bistr:
+        """
+        Apply a transformation to a string, reusing a cached result if possible.
+
+        :param text:
+            The string to transform.
+        :param transform:
+            The transformation to apply, which takes a `bistr` and returns a transformed `bistr` with the same original
+            string.  It must be hashable, as it's part of the cache key.
+        :returns:
+            The transformed string.
+        """
+
+        text = bistr(text)
+        current = text.modified
+
+        key = (transform, current)
+        entry = self._get(key)
+        if entry is None:
+            result = _check(transform, transform(bistr(current)), current)
+            entry = (result.modified, result.alignment)
+            self._put(key, entry)
+
+        modified, alignment = entry
+        return bistr(text.original, modified, text.alignment.compose(alignment))
+
+    def _get(self, key: Hashable) -> Optional[Tuple[str, Alignment]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: Hashable, entry: Tuple[str, Alignment]) -> None:
+        with self._lock:
+            entries = self._entries
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self._maxsize:
+                entries.popitem(last=False)
+                self._evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """
+        :returns:
+            Statistics about this cache's performance, like :func:`functools.lru_cache`.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """
+        Clear this cache and its statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
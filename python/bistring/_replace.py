@@ -0,0 +1,304 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from __future__ import annotations
+
+__all__ = ['Replacer', 'RewriteRules']
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Match, Optional, Pattern, Tuple, cast
+
+from ._bistr import bistr, String
+from ._regex import compile_regex, expand_template
+from ._typing import Edit, Regex, Replacement
+
+
+_Node = Dict[str, Any]
+
+
+class Replacer:
+    """
+    A compiled set of literal string replacements, which are all applied simultaneously in a single pass.
+
+        >>> r = Replacer({'lol': 'laughing out loud', 'lo': 'LO', 'o': '0'})
+        >>> s = r('lol, lo, or lo-fi')
+        >>> s.modified
+        'laughing out loud, LO, 0r LO-fi'
+        >>> s[:17]
+        bistr('lol', 'laughing out loud')
+
+    Matches are found from left to right, preferring the longest match at each position, and never overlap.  A
+    `Replacer` is compiled once, can be reused on any number of strings, and can be pickled to ship it to other
+    processes.  See also :meth:`bistr.replace_many` and :meth:`BistrBuilder.replace_many`.
+    """
+
+    _trie: _Node
+    """
+    A trie of the patterns, where each node maps the next character to its child, and ``''`` to the replacement for a
+    pattern ending at that node.
+    """
+
+    _starts: Optional[Pattern[str]]
+    """
+    A regex that matches the first character of any pattern, used to skip quickly to the next candidate match.
+    """
+
+    def __init__(self, replacements: Mapping[str, str]):
+        """
+        :param replacements:
+            A mapping from the substrings to replace to their replacements.
+        :raises:
+            :class:`ValueError` if any of the substrings to replace is empty.
+        """
+
+        trie: _Node = {}
+        for old, new in replacements.items():
+            if not old:
+                raise ValueError('Cannot replace an empty string')
+
+            node = trie
+            for c in old:
+                node = node.setdefault(c, {})
+            node[''] = new
+
+        self._trie = trie
+
+        if trie:
+            self._starts = re.compile('[' + ''.join(map(re.escape, sorted(trie))) + ']')
+        else:
+            self._starts = None
+
+    def __call__(self, text: String) -> bistr:
+        """
+        Apply these replacements to a string.
+        """
+        return bistr(text).replace_many(self)
+
+    def edits(self, text: str, pos: int = 0) -> Iterator[Edit]:
+        """
+        Find all the replacements to make in a string.
+
+            >>> r = Replacer({'lol': 'laughing out loud', 'lo': 'LO', 'o': '0'})
+            >>> list(r.edits('lol, lo, or lo-fi'))
+            [(0, 3, 'laughing out loud'), (5, 7, 'LO'), (9, 10, '0'), (12, 14, 'LO')]
+
+        :param text:
+            The string to search.
+        :param pos:
+            The position to start searching from.
+        :returns:
+            The edits to apply, as ``(start, end, replacement)`` tuples suitable for :meth:`bistr.apply_edits`.
+        """
+
+        starts = self._starts
+        if starts is None:
+            return
+
+        trie = self._trie
+        search = starts.search
+        length = len(text)
+
+        while True:
+            match = search(text, pos)
+            if not match:
+                return
+
+            start = match.start()
+            end = start
+            repl = None
+
+            node = trie
+            i = start
+            while i < length:
+                child: Optional[_Node] = node.get(text[i])
+                if child is None:
+                    break
+                node = child
+                i += 1
+                if '' in node:
+                    end = i
+                    repl = node['']
+
+            if repl is None:
+                pos = start + 1
+            else:
+                yield start, end, repl
+                pos = end
+
+
+_GLOBAL_FLAGS = re.compile(r'\(\?[aiLmsux]+\)')
+"""
+Inline global flags like ``(?i)``, which are only allowed at the start of a pattern.  They're already reflected in
+``pattern.flags``.
+"""
+
+_BACKREFERENCE = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]|\(\?\([0-9]+\)')
+r"""
+A numbered backreference like ``\1``, or a conditional group reference like ``(?(1)a|b)``.  May also match an octal
+escape in a character class or an escaped parenthesis, which is fine to overestimate.
+"""
+
+_SCOPED_FLAGS = [
+    (re.ASCII, 'a'),
+    (re.IGNORECASE, 'i'),
+    (re.MULTILINE, 'm'),
+    (re.DOTALL, 's'),
+    (re.VERBOSE, 'x'),
+]
+
+
+class RewriteRules:
+    r"""
+    An ordered list of regex substitution rules, which are all applied simultaneously in a single pass.
+
+        >>> rules = RewriteRules([
+        ...     (r'\s+', ' '),
+        ...     (r'(\d+)%', r'\1 percent'),
+        ...     (r'\d+', '#'),
+        ... ])
+        >>> s = rules('Up  50% in\t2019')
+        >>> s.modified
+        'Up 50 percent in #'
+        >>> s[3:13]
+        bistr('50%', '50 percent')
+
+    At each position, the first rule that matches wins.  Unlike a sequence of :meth:`bistr.sub` calls, the output of
+    one rule is never seen by later ones, and each rule's replacement sees only its own groups.  Named groups must be
+    unique across all the rules.  The rules are compiled into a single regex that tries each of them in order, as long
+    as they are :mod:`re` patterns without numbered backreferences (like ``(a)\1``).  Otherwise, each rule is searched
+    for separately, which gives the same result more slowly.
+    """
+
+    _rules: List[Tuple[Pattern[str], Replacement]]
+    """
+    The individually compiled rules.
+    """
+
+    _regex: Optional[Pattern[str]]
+    """
+    The combined regex, with one group per rule, or ``None`` if the rules have to be searched for separately.
+    """
+
+    _groups: Dict[int, int]
+    """
+    Maps the index of each rule's group in the combined regex to the index of the rule.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[Regex, Replacement]]):
+        """
+        :param rules:
+            The ``(regex, replacement)`` rules to apply, in order of priority.  Each regex may be a string pattern or a
+            compiled regex, and each replacement is interpreted as in :meth:`bistr.sub`.
+        """
+
+        self._rules = []
+        self._groups = {}
+
+        parts: Optional[List[str]] = []
+        group = 1
+        for regex, repl in rules:
+            pattern = compile_regex(regex)
+            self._rules.append((pattern, repl))
+            self._groups[group] = len(self._groups)
+            group += pattern.groups + 1
+
+            if parts is None:
+                continue
+            elif not isinstance(pattern, re.Pattern) or _BACKREFERENCE.search(pattern.pattern):
+                # Other regex engines can't be combined with re patterns, and backreferences would need renumbering
+                parts = None
+                continue
+
+            flags = ''.join(c for flag, c in _SCOPED_FLAGS if pattern.flags & flag)
+            source = pattern.pattern
+            flags_match = _GLOBAL_FLAGS.match(source)
+            while flags_match:
+                source = source[flags_match.end():]
+                flags_match = _GLOBAL_FLAGS.match(source)
+            if pattern.flags & re.VERBOSE:
+                # Don't let a trailing comment swallow the closing parenthesis
+                source += '\n'
+            if flags:
+                parts.append(f'((?{flags}:{source}))')
+            else:
+                parts.append(f'({source})')
+
+        if parts:
+            self._regex = re.compile('|'.join(parts))
+        else:
+            self._regex = None
+
+    def __call__(self, text: String) -> bistr:
+        """
+        Apply these rules to a string.
+        """
+        return bistr(text).sub_all(self)
+
+    def edits(self, text: str, pos: int = 0) -> Iterator[Edit]:
+        r"""
+        Find all the substitutions to make in a string.
+
+            >>> rules = RewriteRules([(r'colou?r', 'hue'), (r'\w+', lambda m: m.group().upper())])
+            >>> list(rules.edits('red colour', 3))
+            [(4, 10, 'hue')]
+
+        :param text:
+            The string to search.
+        :param pos:
+            The position to start searching from.
+        :returns:
+            The edits to apply, as ``(start, end, replacement)`` tuples suitable for :meth:`bistr.apply_edits`.
+        """
+
+        regex = self._regex
+        if regex is None:
+            yield from self._edits_by_rule(text, pos)
+            return
+
+        rules = self._rules
+        groups = self._groups
+
+        for match in regex.finditer(text, pos):
+            # The rule's group is the outermost one that matched, so it's closed last
+            pattern, repl = rules[groups[cast(int, match.lastindex)]]
+            if isinstance(repl, str) and '\\' not in repl:
+                result = repl
+            else:
+                # Match the rule by itself, so the replacement sees the groups it expects
+                submatch = pattern.match(text, match.start())
+                if not submatch or submatch.end() != match.end():
+                    raise ValueError(f'Rule {pattern.pattern!r} matched differently when combined with the others')
+                result = expand_template(submatch, repl)
+
+            yield match.start(), match.end(), result
+
+    def _edits_by_rule(self, text: str, pos: int) -> Iterator[Edit]:
+        """
+        Like :meth:`edits`, but searching for each rule separately.  The next match of each rule is remembered until
+        the text before it has been consumed, so every rule is still only scanned once.
+        """
+
+        rules = self._rules
+        matches: List[Optional[Match[str]]] = [pattern.search(text, pos) for pattern, _ in rules]
+
+        while True:
+            best = None
+            for i, match in enumerate(matches):
+                if match and (best is None or match.start() < best.start()):
+                    best = match
+                    repl = rules[i][1]
+            if best is None:
+                return
+
+            start, end = best.span()
+            yield start, end, expand_template(best, repl)
+
+            for i, match in enumerate(matches):
+                if match is None:
+                    continue
+                if match.start() < end:
+                    match = rules[i][0].search(text, end)
+                # Like finditer(), don't allow another empty match where the last one was
+                if match and start == end == match.start() == match.end():
+                    match = rules[i][0].search(text, end + 1) if end < len(text) else None
+                matches[i] = match
@@ -17,13 +17,13 @@ __all__ = [
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 import icu
-import threading
-from typing import Callable, Iterable, Iterator, Optional, Sequence, Union, overload
+from typing import Callable, Iterable, Iterator, Literal, Sequence, Union, overload
 
 from ._alignment import Alignment
 from ._bistr import bistr, String
+from ._icu import _get_break_iterator
 from ._regex import compile_regex
-from ._typing import AnyBounds, Bounds, Index, Regex
+from ._typing import AnyBounds, Bounds, Index, ManyBounds, MaskedBounds, Regex
 
 
 @dataclass(frozen=True)
@@ -245,6 +245,74 @@ class Tokenization:
         text_bounds = self.text.alignment.modified_bounds(*args)
         return self.alignment.modified_bounds(text_bounds)
 
+    @overload
+    def text_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def text_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def text_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def text_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Like :meth:`text_bounds`, but maps many spans of tokens at once.  See :meth:`Alignment.original_bounds_many` for
+        details.
+        """
+        return self.alignment.original_bounds_many(starts, stops, mask=mask)
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def original_bounds_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Like :meth:`original_bounds`, but maps many spans of tokens at once.
+
+            >>> tokens = Tokenization.infer('  hello, world!', ['hello', 'world'])
+            >>> tokens.original_bounds_many([0, 1, 0], [1, 2, 2])
+            ([2, 9, 2], [7, 14, 14])
+        """
+        # Spans that fail to map are mapped to -1, which also fails in the second step
+        text_starts, text_stops, *_ = self.text_bounds_many(starts, stops, mask=mask)
+        return self.text.alignment.original_bounds_many(text_starts, text_stops, mask=mask)
+
+    @overload
+    def bounds_for_text_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def bounds_for_text_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def bounds_for_text_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def bounds_for_text_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Like :meth:`bounds_for_text`, but maps many spans of text at once.
+        """
+        return self.alignment.modified_bounds_many(starts, stops, mask=mask)
+
+    @overload
+    def bounds_for_original_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[False] = False) -> ManyBounds: ...
+
+    @overload
+    def bounds_for_original_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: Literal[True]) -> MaskedBounds: ...
+
+    @overload
+    def bounds_for_original_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool) -> Union[ManyBounds, MaskedBounds]: ...
+
+    def bounds_for_original_many(self, starts: Sequence[int], stops: Sequence[int], *, mask: bool = False) -> Union[ManyBounds, MaskedBounds]:
+        """
+        Like :meth:`bounds_for_original`, but maps many spans of original text at once.
+        """
+        text_starts, text_stops, *_ = self.text.alignment.modified_bounds_many(starts, stops, mask=mask)
+        return self.alignment.modified_bounds_many(text_starts, text_stops, mask=mask)
+
     def slice_by_text(self, *args: AnyBounds) -> Tokenization:
         """
         Map a span of text to the corresponding span of tokens.
@@ -365,22 +433,17 @@ class _IcuTokenizer(Tokenizer):
     """
 
     def __init__(self, locale: str, constructor: Callable[[icu.Locale], icu.BreakIterator]):
-        # BreakIterator is not a thread-safe API, so store a cache of
-        # thread-local iterators
-        self._locale = icu.Locale(locale)
+        # BreakIterator is not a thread-safe API, so we use thread-local
+        # iterators, shared with other tokenizers for the same locale
+        self._locale = locale
         self._constructor = constructor
-        self._local = threading.local()
 
         # Eagerly construct one on this thread as an optimization, and to check
         # for errors
         self._break_iterator()
 
     def _break_iterator(self) -> icu.BreakIterator:
-        bi: Optional[icu.BreakIterator] = getattr(self._local, 'bi', None)
-        if bi is None:
-            bi = self._constructor(self._locale)
-            self._local.bi = bi
-        return bi
+        return _get_break_iterator(self._constructor, self._locale)
 
     def tokenize(self, text: String) -> Tokenization:
         text = bistr(text)
@@ -1,15 +1,21 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT license.
 
-from typing import Callable, Match, Pattern, Tuple, Union
+from typing import Callable, Match, Optional, Pattern, Protocol, Sequence, Tuple, Union
 
 
 BiIndex = Tuple[int, int]
 
 Bounds = Tuple[int, int]
 
+Edit = Tuple[int, int, str]
+
 AnyBounds = Union[int, range, slice, Bounds]
 
+ManyBounds = Tuple[Sequence[int], Sequence[int]]
+
+MaskedBounds = Tuple[Sequence[int], Sequence[int], Sequence[bool]]
+
 Index = Union[int, slice]
 
 Range = Union[range, slice, Bounds]
@@ -17,3 +23,12 @@ Range = Union[range, slice, Bounds]
 Regex = Union[str, Pattern[str]]
 
 Replacement = Union[str, Callable[[Match[str]], str]]
+
+
+class TranslationTable(Protocol):
+    """
+    Anything :meth:`str.translate` accepts: a table indexed by code point, which raises :class:`LookupError` for
+    characters that should be left alone.
+    """
+
+    def __getitem__(self, key: int) -> Optional[Union[str, int]]: ...
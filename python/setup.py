@@ -48,10 +48,14 @@ setup(
         'pyicu',
     ],
     extras_require={
+        'numpy': [
+            'numpy',
+        ],
         'dev': [
             'exceptiongroup',
             'lxml',
             'mypy',
+            'numpy',
             'pytest',
             'regex',
             'tomli',
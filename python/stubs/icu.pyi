@@ -42,12 +42,21 @@ class CaseMap:
 class Edits:
     def __init__(self) -> None: ...
 
+    def hasChanges(self) -> bool: ...
+
     def getFineIterator(self) -> Iterator[Tuple[bool, int, int, int, int, int]]: ...
 
+    def getFineChangesIterator(self) -> Iterator[Tuple[bool, int, int, int, int, int]]: ...
+
 
 class Locale:
     def __init__(self, name: str): ...
 
+    @classmethod
+    def getDefault(cls) -> Locale: ...
+
+    def getLanguage(self) -> str: ...
+
 
 class Normalizer2:
     @classmethod
@@ -66,6 +75,8 @@ class Normalizer2:
 
     def hasBoundaryBefore(self, c: UString) -> bool: ...
 
+    def spanQuickCheckYes(self, text: UString) -> int: ...
+
 
 class UnicodeString:
     def __init__(self, string: str): ...
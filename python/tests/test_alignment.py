@@ -129,6 +129,24 @@ def test_compose_identity():
     _test_identity_composition(alignment.inverse())
 
 
+def test_compose_identity_fast_path(monkeypatch):
+    alignment = Alignment([(0, 0), (0, 1), (0, 2), (1, 3), (2, 3), (3, 3), (4, 4)])
+    left = Alignment.identity(alignment.original_range())
+    right = Alignment.identity(alignment.modified_range())
+
+    # Inner pairs with the same original position are dropped, exactly as the general algorithm would
+    expected = Alignment([(0, 0), (0, 2), (1, 3), (2, 3), (3, 3), (4, 4)])
+    assert alignment.compose(right) == expected
+    assert left.compose(alignment) == expected
+    assert alignment.inverse().compose(left) == Alignment([(0, 0), (1, 0), (2, 0), (3, 1), (3, 3), (4, 4)])
+    assert expected.compose(right) is expected
+
+    fast = [alignment.compose(right), left.compose(alignment), alignment.inverse().compose(left)]
+    monkeypatch.setattr(Alignment, '_is_identity', lambda self: False)
+    slow = [alignment.compose(right), left.compose(alignment), alignment.inverse().compose(left)]
+    assert [list(a) for a in fast] == [list(a) for a in slow]
+
+
 def test_infer():
     assert Alignment.infer('test', 'test') == Alignment.identity(4)
     assert Alignment.infer('asdf', 'jkl;') == Alignment.identity(4)
@@ -153,3 +171,372 @@ def test_infer():
         (4, 2),
         (5, 2),
     ])
+
+
+def test_storage():
+    pytest.raises(ValueError, Alignment, [(0, 0)], storage='dict')
+
+    data = [(0, 0), (1, 2), (2, 4), (3, 6)]
+    compact = Alignment(data, storage='array')
+    assert compact.storage == 'array'
+    assert compact == Alignment(data)
+    assert list(compact) == data
+
+    assert compact.original_bounds(1, 3) == (0, 2)
+    assert compact.modified_bounds(1, 2) == (2, 4)
+    assert compact[1:3] == Alignment(data[1:3])
+    assert compact.shift(1, 1) == Alignment(data).shift(1, 1)
+    assert compact.slice_by_original(1, 2) == Alignment(data).slice_by_original(1, 2)
+    assert compact.slice_by_modified(1, 3) == Alignment(data).slice_by_modified(1, 3)
+    assert compact.inverse() == Alignment(data).inverse()
+    assert compact + Alignment([(3, 6), (4, 8)]) == Alignment(data + [(4, 8)])
+
+    identity = Alignment.identity(6, storage='array')
+    assert repr(identity) == 'Alignment.identity(6)'
+    composed = compact.compose(identity)
+    assert composed == Alignment(data)
+    assert composed.storage == 'array'
+    _test_composition(compact, identity)
+
+    composed = Alignment.identity(3, storage='array').compose(Alignment(data))
+    assert composed == compact
+    assert composed.storage == 'array'
+
+    default = Alignment.default_storage
+    try:
+        Alignment.default_storage = 'array'
+        assert Alignment.identity(3).storage == 'array'
+        assert Alignment.infer('color', 'colour').storage == 'array'
+    finally:
+        Alignment.default_storage = default
+
+
+def test_runs():
+    # Adjacent diagonal pairs are stored as a single run, whichever way they were produced
+    assert Alignment([(0, 0), (1, 1), (2, 2)]) == Alignment.identity(2)
+    assert Alignment([(0, 0), (1, 1)]) + Alignment([(1, 1), (2, 2)]) == Alignment.identity(2)
+    assert Alignment([(0, 0), (5, 1), (6, 2)]).slice_by_original(4, 6) == Alignment.identity(4, 6).shift(0, -4)
+
+    # Memory and time scale with the number of edits, not the length of the sequences
+    length = 10**12
+    alignment = Alignment.identity(length)
+    assert len(alignment) == length + 1
+    assert alignment[-1] == (length, length)
+    assert alignment[length // 2:length // 2 + 3] == Alignment.identity(length // 2, length // 2 + 2)
+
+    edited = Alignment([(0, 0), (1, 2)]) + Alignment.identity(1, length).shift(0, 1)
+    assert edited.original_bounds(2, 3) == (1, 2)
+    assert edited.modified_bounds(length - 1, length) == (length, length + 1)
+    assert edited.slice_by_modified(1, 5) == Alignment([(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)])
+
+    composed = edited.compose(edited.inverse())
+    assert composed.original_bounds(0, 1) == (0, 1)
+    assert composed.slice_by_original(10, 20) == Alignment.identity(10, 20)
+    assert list(composed[:3]) == [(0, 0), (1, 1), (2, 2)]
+
+    # Duplicate pairs are dropped everywhere, not just by the constructor
+    assert list(Alignment([(0, 0), (0, 0)])) == [(0, 0)]
+    assert list(Alignment([(0, 0), (2, 0)]).slice_by_original(1, 1)) == [(1, 0)]
+    assert list(Alignment([(0, 0), (0, 2)]).slice_by_modified(1, 1)) == [(0, 1)]
+    composed = Alignment([(0, 0), (1, 1), (2, 2), (2, 3), (2, 4)]).compose(Alignment([(0, 0), (2, 1), (4, 1)]))
+    assert list(composed) == [(0, 0), (2, 1)]
+    assert len(composed) == 2
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_bounds_many(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr('bistring._alignment.import_numpy', lambda: None)
+
+    alignment = Alignment([(0, 0), (1, 2), (2, 4), (3, 6)]) + Alignment.identity(3, 10).shift(0, 3)
+    o_start, o_stop = alignment.original_bounds()
+    m_start, m_stop = alignment.modified_bounds()
+
+    spans = [(i, j) for i in range(m_start, m_stop + 1) for j in range(i, m_stop + 1)]
+    starts, stops = map(list, zip(*spans))
+    assert list(zip(*alignment.original_bounds_many(starts, stops))) == [alignment.original_bounds(i, j) for i, j in spans]
+
+    spans = [(i, j) for i in range(o_start, o_stop + 1) for j in range(i, o_stop + 1)]
+    starts, stops = map(list, zip(*spans))
+    assert list(zip(*alignment.modified_bounds_many(starts, stops))) == [alignment.modified_bounds(i, j) for i, j in spans]
+
+    with pytest.raises(IndexError, match='range end too big'):
+        alignment.original_bounds_many([0, 1], [1, m_stop + 1])
+    with pytest.raises(IndexError, match='range start too small'):
+        alignment.modified_bounds_many([0, -1], [1, 2])
+
+    first, last, valid = alignment.original_bounds_many([0, -1, 1], [1, 2, m_stop + 1], mask=True)
+    assert list(first) == [0, -1, -1]
+    assert list(last) == [1, -1, -1]
+    assert list(valid) == [True, False, False]
+
+    assert alignment.original_bounds_many([], []) == ([], [])
+
+
+def test_bounds_many_numpy():
+    np = pytest.importorskip('numpy')
+
+    alignment = Alignment.identity(5).shift(1, 0)
+    first, last = alignment.original_bounds_many(np.array([0, 1]), np.array([2, 3]))
+    assert isinstance(first, np.ndarray)
+    assert first.tolist() == [1, 2]
+    assert last.tolist() == [3, 4]
+
+
+def test_infer_banded():
+    pairs = [
+        ('color', 'colour'),
+        ('kitten', 'sitting'),
+        ('the quick brown fox', 'the quack brown fax'),
+        ('', 'abc'),
+        ('abc', ''),
+        ('ab---', 'ab'),
+        ('asdf', 'jkl;'),
+    ]
+
+    unit = lambda a, b: int(a != b)
+    weighted = lambda a, b: 2 if a is None or b is None else 3 * int(a != b)
+
+    for original, modified in pairs:
+        for cost_fn in [unit, weighted]:
+            expected = Alignment.infer(original, modified, cost_fn)
+            # Too narrow bands are widened automatically
+            for max_distance in [0, 1, 3, 100]:
+                assert Alignment.infer(original, modified, cost_fn, max_distance=max_distance) == expected
+
+        # max_distance selects the banded Hirschberg algorithm, which Myers' algorithm can't replace
+        expected = Alignment.infer(original, modified, method='hirschberg')
+        assert Alignment.infer(original, modified, max_distance=1) == expected
+        pytest.raises(ValueError, Alignment.infer, original, modified, max_distance=1, method='myers')
+
+
+def _alignment_cost(alignment, original, modified):
+    cost = 0
+    pairs = list(alignment)
+    for (o0, m0), (o1, m1) in zip(pairs, pairs[1:]):
+        if o1 > o0 and m1 > m0:
+            cost += int(original[o0] != modified[m0])
+        else:
+            cost += 1
+    return cost
+
+
+def test_infer_myers():
+    import random
+
+    rng = random.Random(0)
+    pairs = [
+        ('color', 'colour'),
+        ('kitten', 'sitting'),
+        ('the quick brown fox', 'the quack brown fax'),
+        ('', ''),
+        ('', 'abc'),
+        ('abc', ''),
+        ('asdf', 'jkl;'),
+        (list('abcabba'), list('cbabac')),
+        (list('abc'), 'abc'),
+    ]
+    for _ in range(500):
+        original = ''.join(rng.choice('abc') for _ in range(rng.randrange(16)))
+        modified = ''.join(rng.choice('abc') for _ in range(rng.randrange(16)))
+        pairs.append((original, modified))
+
+    for original, modified in pairs:
+        myers = Alignment.infer(original, modified, method='myers')
+        hirschberg = Alignment.infer(original, modified, method='hirschberg')
+        assert myers[0] == (0, 0)
+        assert myers[-1] == (len(original), len(modified))
+        assert all(o1 - o0 <= 1 and m1 - m0 <= 1 for (o0, m0), (o1, m1) in zip(myers, myers[1:]))
+        assert _alignment_cost(myers, original, modified) == _alignment_cost(hirschberg, original, modified)
+
+    assert Alignment.infer('kitten', 'sitting') == Alignment.infer('kitten', 'sitting', method='myers')
+
+    pytest.raises(ValueError, Alignment.infer, 'a', 'b', lambda a, b: 1, method='myers')
+    pytest.raises(ValueError, Alignment.infer, 'a', 'b', method='dijkstra')
+
+
+def test_infer_myers_fallback(monkeypatch):
+    import bistring._alignment
+    import random
+
+    rng = random.Random(0)
+
+    # Unrelated sequences are too expensive for Myers' algorithm alone, so it falls back to Hirschberg's
+    fallbacks = []
+    infer_recursive = Alignment._infer_recursive.__func__
+
+    def spy(cls, *args):
+        fallbacks.append(args[4:])
+        return infer_recursive(cls, *args)
+
+    monkeypatch.setattr(Alignment, '_infer_recursive', classmethod(spy))
+    original = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(1000))
+    modified = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(1000))
+    myers = Alignment.infer(original, modified)
+    assert fallbacks
+    fallbacks.clear()
+    hirschberg = Alignment.infer(original, modified, method='hirschberg', anchor=False)
+    assert _alignment_cost(myers, original, modified) == _alignment_cost(hirschberg, original, modified)
+
+    # Similar sequences don't need it
+    fallbacks.clear()
+    modified = original[:500] + 'x' + original[500:]
+    assert _alignment_cost(Alignment.infer(original, modified), original, modified) == 1
+    assert not fallbacks
+    monkeypatch.undo()
+
+    # Force the fallback at every level, and for unhashable elements, which can't use it
+    monkeypatch.setattr(bistring._alignment, '_myers_limit', lambda olength, mlength: 1)
+    for _ in range(200):
+        original = ''.join(rng.choice('abc') for _ in range(rng.randrange(30)))
+        modified = ''.join(rng.choice('abc') for _ in range(rng.randrange(30)))
+        hirschberg = Alignment.infer(original, modified, method='hirschberg', anchor=False)
+        for o, m in [(original, modified), ([[c] for c in original], [[c] for c in modified])]:
+            myers = Alignment.infer(o, m)
+            assert myers[0] == (0, 0)
+            assert myers[-1] == (len(original), len(modified))
+            assert _alignment_cost(myers, original, modified) == _alignment_cost(hirschberg, original, modified)
+
+
+def test_infer_anchored():
+    import random
+
+    rng = random.Random(0)
+    original = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz ') for _ in range(2000))
+    modified = original[:500] + 'XYZ' + original[510:1500] + original[1501:]
+
+    cost_fn = lambda a, b: int(a != b)
+    anchored = Alignment.infer(original, modified, cost_fn, anchor=True)
+    assert anchored[0] == (0, 0)
+    assert anchored[-1] == (len(original), len(modified))
+    assert all(o1 - o0 <= 1 and m1 - m0 <= 1 for (o0, m0), (o1, m1) in zip(anchored, anchored[1:]))
+    assert _alignment_cost(anchored, original, modified) == 11
+    assert anchored.original_bounds(0, 500) == (0, 500)
+    assert anchored.original_bounds(503, 1493) == (510, 1500)
+
+    tokens = original.split()
+    assert Alignment.infer(tokens, tokens[1:], cost_fn, anchor=True) == Alignment.infer(tokens, tokens[1:], cost_fn)
+
+    # Short k-mers that only repeat by chance in a small alphabet shouldn't be used as anchors
+    for alphabet in ['ab', 'abcd', 'acgt' * 4 + 'n']:
+        for _ in range(20):
+            original = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(100, 300)))
+            modified = list(original)
+            for _ in range(10):
+                i = rng.randrange(len(modified))
+                modified[i:i + rng.randrange(3)] = rng.choice(alphabet) * rng.randrange(3)
+            modified = ''.join(modified)
+
+            optimal = Alignment.infer(original, modified, cost_fn)
+            anchored = Alignment.infer(original, modified, cost_fn, anchor=True)
+            assert _alignment_cost(anchored, original, modified) == _alignment_cost(optimal, original, modified)
+
+
+def test_infer_unit_costs():
+    import random
+
+    rng = random.Random(0)
+    unit = lambda a, b: int(a != b)
+
+    for _ in range(200):
+        original = ''.join(rng.choice('abc') for _ in range(rng.randrange(40)))
+        modified = ''.join(rng.choice('abc') for _ in range(rng.randrange(40)))
+        # The bit-parallel cost rows must produce exactly the same alignment as computing them cell by cell
+        expected = Alignment.infer(original, modified, unit, anchor=False)
+        assert Alignment.infer(original, modified, method='hirschberg', anchor=False) == expected
+        assert Alignment.infer(list(original), modified, method='hirschberg', anchor=False) == expected
+
+    unhashable = [[c] for c in 'kitten']
+    assert Alignment.infer(unhashable, [[c] for c in 'sitting'], method='hirschberg') == Alignment.infer('kitten', 'sitting', unit)
+
+
+def test_infer_cost_table(monkeypatch):
+    import random
+
+    pytest.importorskip('numpy')
+
+    rng = random.Random(0)
+    weighted = lambda a, b: 2 if a is None or b is None else 3 * int(a != b)
+    fractional = lambda a, b: 1.5 if a is None or b is None else 0.75 * int(a != b)
+
+    cases = []
+    for _ in range(100):
+        original = ''.join(rng.choice('abcd') for _ in range(rng.randrange(30)))
+        modified = ''.join(rng.choice('abcd') for _ in range(rng.randrange(30)))
+        cases.append((original, modified))
+
+    def infer_all():
+        return [
+            Alignment.infer(original, modified, cost_fn, anchor=False)
+            for original, modified in cases
+            for cost_fn in [weighted, fractional]
+        ]
+
+    vectorized = infer_all()
+    monkeypatch.setattr('bistring._alignment.import_numpy', lambda: None)
+    assert infer_all() == vectorized
+
+
+def test_infer_memory():
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    original = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(1000))
+    modified = ''.join(c if rng.random() < 0.95 else 'X' for c in original)
+
+    # Warm up any lazy initialization
+    Alignment.infer(original[:10], modified[:10], method='hirschberg', anchor=False)
+
+    tracemalloc.start()
+    try:
+        Alignment.infer(original, modified, method='hirschberg', anchor=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Hirschberg's algorithm should only need a few rows of costs, without copying the sequences at every level
+    assert peak < 80 * (len(original) + len(modified))
+
+
+def test_infer_parallel(monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    import random
+
+    # Make sure even small inputs are split in parallel
+    monkeypatch.setattr('bistring._alignment._PARALLEL_CELLS', 64)
+
+    rng = random.Random(0)
+    original = ''.join(rng.choice('abcd') for _ in range(100))
+    modified = ''.join(rng.choice('abcd') for _ in range(80))
+
+    expected = Alignment.infer(original, modified, method='hirschberg', anchor=False)
+    assert Alignment.infer(original, modified, method='hirschberg', anchor=False, workers=2) == expected
+    assert Alignment.infer(modified, original, method='hirschberg', anchor=False, workers=2) == expected.inverse()
+
+    with ThreadPoolExecutor(2) as executor:
+        assert Alignment.infer(original, modified, method='hirschberg', anchor=False, executor=executor) == expected
+
+    with ProcessPoolExecutor(2) as executor:
+        pytest.raises(ValueError, Alignment.infer, original, modified, workers=2, executor=executor)
+
+
+def test_infer_parallel_small(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError('started a process pool')
+
+    monkeypatch.setattr('bistring._alignment.ProcessPoolExecutor', no_pool)
+
+    # Myers' algorithm doesn't use the pool
+    original = 'the quick brown fox jumps over the lazy dog' * 100
+    modified = 'the quick brown fox jumped over the lazy dogs' * 100
+    assert Alignment.infer(original, modified, workers=2) == Alignment.infer(original, modified)
+
+    # Neither do small problems
+    assert Alignment.infer('kitten', 'sitting', method='hirschberg', workers=2) == Alignment.infer('kitten', 'sitting', method='hirschberg')
+
+    # Nor does the banded algorithm, however large the problem
+    monkeypatch.setattr('bistring._alignment._PARALLEL_CELLS', 1)
+    assert Alignment.infer('kitten', 'sitting', max_distance=3, workers=2) == Alignment.infer('kitten', 'sitting', max_distance=3)
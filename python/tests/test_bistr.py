@@ -1,7 +1,7 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT license.
 
-from bistring import Alignment, bistr
+from bistring import Alignment, BistrBuilder, bistr
 import pytest
 import unicodedata
 
@@ -39,6 +39,15 @@ def test_infer():
 
     assert bs.inverse() == bistr.infer('colour', 'color')
 
+    assert bistr.infer('color', 'colour', max_distance=1) == bs
+    assert bistr.infer('color', 'colour', anchor=True) == bs
+
+    # The options are keyword-only, like Alignment.infer()
+    from bistring._infer import heuristic_infer
+    assert heuristic_infer('color', 'colour', max_distance=1, anchor=True) == bs
+    pytest.raises(TypeError, heuristic_infer, 'color', 'colour', 1)
+    pytest.raises(TypeError, Alignment.infer, 'color', 'colour', None, 1)
+
     bs = bistr.infer("--Hello, world!--", "hello world")
     assert bs[:5] == bistr("Hello", "hello", Alignment.identity(5))
     assert bs[6:] == bistr("world")
@@ -230,6 +239,54 @@ def test_expandtabs():
     assert bs[30:31] == bistr('\n')
 
 
+def test_translate():
+    table = bistr.maketrans({'“': '"', '”': '"', '…': '...', 'ﬁ': 'fi', '\u00ad': None, 'x': 'x', 'z': ord('Z')})
+
+    bs = bistr('“The ﬁrst\u00adclass zebra…”').translate(table)
+    assert bs.modified == bs.original.translate(table)
+    assert bs[0:1] == bistr('“', '"')
+    assert bs[1:4] == bistr('The')
+    assert bs[5:7] == bistr('ﬁ', 'fi')
+    assert bs[7:15] == bistr('rst\u00adclass', 'rstclass', Alignment([(0, 0), (1, 1), (2, 2), (3, 3), (4, 3), (5, 4), (6, 5), (7, 6), (8, 7), (9, 8)]))
+    assert bs[16:17] == bistr('z', 'Z')
+    assert bs[21:24] == bistr('…', '...')
+
+    bs = bistr('hello world')
+    assert bs.translate(table) is bs
+
+    bs = bistr('Xylophone', 'xylophone', Alignment.identity(9)).translate(table)
+    assert bs == bistr('Xylophone', 'xylophone', Alignment.identity(9))
+
+
+def test_translate_mixed_keys():
+    table = {'a': 'b', ord('c'): 'd', -1: 'e', 0x110000: 'f'}
+    bs = bistr('abc').translate(table)
+    assert bs.modified == bs.original.translate(table) == 'abd'
+    assert bs[2:3] == bistr('c', 'd')
+
+
+def test_translate_lookup():
+    class Table:
+        def __getitem__(self, key):
+            if key == ord('-'):
+                return None
+            elif key == ord('ß'):
+                return 'SS'
+            elif 'a' <= chr(key) <= 'z':
+                return key - 32
+            else:
+                raise LookupError(key)
+
+    table = Table()
+    bs = bistr('straße-bahn 42').translate(table)
+    assert bs.modified == bs.original.translate(table) == 'STRASSEBAHN 42'
+    assert bs[4:6] == bistr('ß', 'SS')
+    assert bs[6:11] == bistr('e-bahn', 'EBAHN', Alignment([(0, 0), (1, 1), (2, 1), (3, 2), (4, 3), (5, 4), (6, 5)]))
+
+    bs = bistr('42 + 42')
+    assert bs.translate(table) is bs
+
+
 def test_strip():
     bs = bistr('  Hello  world!  ')
     assert bs.original == '  Hello  world!  '
@@ -313,6 +370,55 @@ def test_upper():
     assert bs.modified == 'ὈΔΥΣΣΕΎΣ'
 
 
+def _edit_by_chars(bs, op, locale):
+    # The straightforward algorithm, walking every span that ICU reports
+    import icu
+
+    builder = BistrBuilder(bs)
+    edits = icu.Edits()
+    ucur = icu.UnicodeString(builder.current)
+    umod = icu.UnicodeString(op(icu.Locale(locale), ucur, edits))
+    for is_change, old_len, new_len, old_i, new_i, _ in edits.getFineIterator():
+        old_len = ucur.countChar32(old_i, old_len)
+        if is_change:
+            builder.replace(old_len, str(umod[new_i:new_i+new_len]))
+        else:
+            builder.skip(old_len)
+    return builder.build()
+
+
+@pytest.mark.parametrize('op', ['lower', 'upper', 'title'])
+def test_icu_edit_astral(op):
+    import icu
+    import random
+
+    icu_op = getattr(icu.CaseMap, 'to' + op.title())
+
+    rng = random.Random(0)
+    alphabet = 'aB \u00DF\u0130\u03A3\uFB03\U00010400\U00010428\U0001D573\U0001F98A\U00020000'
+    for size in [0, 1, 10, 100]:
+        for _ in range(10):
+            text = ''.join(rng.choice(alphabet) for _ in range(size))
+            for bs in [bistr(text), bistr(text).replace('aB', 'xyz')]:
+                assert getattr(bs, op)('el_GR') == _edit_by_chars(bs, icu_op, 'el_GR')
+
+
+@pytest.mark.parametrize('locale', [None, 'en_US', 'tr_TR', 'az', 'lt_LT', 'el_GR'])
+def test_ascii_case(locale):
+    from bistring._icu import _edit
+    import icu
+
+    text = ''.join(map(chr, range(128)))
+    for bs in [bistr(text), bistr(text).replace('ABC', 'abc')[5:100], bistr(text)[50:90]]:
+        assert bs.lower(locale) == _edit(bs, icu.CaseMap.toLower, locale)
+        assert bs.upper(locale) == _edit(bs, icu.CaseMap.toUpper, locale)
+        assert bs.casefold() == _edit(bs, icu.CaseMap.fold)
+
+    bs = bistr('IiIi')
+    assert bs.lower('tr_TR').modified == 'ıiıi'
+    assert bs.upper('az').modified == 'IİIİ'
+
+
 def test_title():
     bs = bistr('istanbul').title('en_US')
     assert bs.original == 'istanbul'
@@ -339,6 +445,11 @@ def test_capitalize():
     assert bs.modified == 'Ἴς'
     assert bs.alignment == Alignment.identity(2)
 
+    bs = bistr('iSTANBUL').capitalize('tr_TR')
+    assert bs.original == 'iSTANBUL'
+    assert bs.modified == 'İstanbul'
+    assert bs[0:1] == bistr('i', 'İ')
+
 
 def test_swapcase():
     bs = bistr('hello WORLD').swapcase('en_US')
@@ -358,6 +469,64 @@ def test_swapcase():
     assert bs[0:2] == bistr('ǈ', 'lJ')
 
 
+def _capitalize_by_chunks(bs, locale):
+    # The original implementation, which title-cases and lowercases the whole string
+    from itertools import islice
+
+    builder = BistrBuilder(bs)
+
+    title = bistr(bs.modified).title(locale)
+    for chunk in islice(title.chunks(), 1):
+        builder.replace(len(chunk.original), chunk.modified)
+
+    lower = bistr(bs.modified).lower(locale)
+    for chunk in islice(lower.chunks(), 1, None):
+        builder.replace(len(chunk.original), chunk.modified)
+
+    return builder.build()
+
+
+def _swapcase_by_chars(bs, locale):
+    # The original implementation, which looks up every character in whole-string upper- and lowercase versions
+    builder = BistrBuilder(bs)
+
+    lower = bistr(bs.modified).lower(locale)
+    upper = bistr(bs.modified).upper(locale)
+
+    while not builder.is_complete:
+        i = builder.position
+        cat = unicodedata.category(bs[i])
+        if cat == 'Ll':
+            repl = upper
+        elif cat == 'Lu':
+            repl = lower
+        else:
+            builder.skip(1)
+            continue
+
+        builder.append(repl[repl.alignment.modified_slice(i, i + 1)])
+
+    return builder.build()
+
+
+@pytest.mark.parametrize('locale', ['en_US', 'tr_TR', 'el_GR', 'lt_LT', 'nl_NL'])
+def test_capitalize_swapcase_random(locale):
+    import random
+
+    rng = random.Random(0)
+    alphabet = 'aZ ΣσςΑ\u00DF\u0130\u0131i\u01C8\u0149\u0307\u0301\U00010400\U00010428\U0001F98A.'
+    for size in [0, 1, 2, 10, 100]:
+        for _ in range(20):
+            text = ''.join(rng.choice(alphabet) for _ in range(size))
+            for bs in [bistr(text), bistr(text).replace('Σ', 'SS')]:
+                assert bs.capitalize(locale) == _capitalize_by_chunks(bs, locale)
+                assert bs.swapcase(locale) == _swapcase_by_chars(bs, locale)
+
+            text = ''.join(rng.choice('aAbB iIjJ.') for _ in range(size))
+            assert bistr(text).capitalize(locale) == _capitalize_by_chunks(bistr(text), locale)
+            assert bistr(text).swapcase(locale) == _swapcase_by_chars(bistr(text), locale)
+
+
 def test_normalize():
     # "Héllö" -- é is composed but ö has a combining diaeresis
     bs = bistr('H\u00E9llo\u0308').normalize('NFC')
@@ -375,6 +544,41 @@ def test_normalize():
     assert bs[5:7] == bistr('o\u0308')
 
 
+def _normalize_by_chunks(normalizer, text):
+    # The straightforward algorithm, normalizing one boundary-delimited chunk at a time
+    builder = BistrBuilder(text)
+    while not builder.is_complete:
+        i = builder.position
+        j = i + 1
+        while j < len(text) and not normalizer.hasBoundaryBefore(text[j]):
+            j += 1
+        chunk = text[i:j]
+        repl = normalizer.normalize(chunk)
+        if repl == chunk:
+            builder.skip(len(chunk))
+        else:
+            builder.replace(len(chunk), repl)
+    return builder.build()
+
+
+@pytest.mark.parametrize('form', ['NFC', 'NFKC', 'NFD', 'NFKD'])
+def test_normalize_quick_check(form):
+    import icu
+    import random
+
+    normalizer = getattr(icu.Normalizer2, f'get{form}Instance')()
+
+    rng = random.Random(0)
+    alphabet = 'abc \u00E9e\u0301\u0308\u0323\uFB01\u2126\uAC00\u1100\u1161\u11A8\U0001D573\U0001F98A'
+    for size in [0, 1, 10, 100, 1000]:
+        for density in [0.0, 0.01, 0.5]:
+            chars = [rng.choice(alphabet) if rng.random() < density else rng.choice('abc ') for _ in range(size)]
+            text = ''.join(chars)
+            bs = bistr(text).normalize(form)
+            assert bs.modified == unicodedata.normalize(form, text)
+            assert bs == _normalize_by_chunks(normalizer, text)
+
+
 def test_readme():
     bs = bistr('𝕿𝖍𝖊 𝖖𝖚𝖎𝖈𝖐, 𝖇𝖗𝖔𝖜𝖓 🦊 𝖏𝖚𝖒𝖕𝖘 𝖔𝖛𝖊𝖗 𝖙𝖍𝖊 𝖑𝖆𝖟𝖞 🐶')
     bs = bs.normalize('NFKD')
@@ -408,6 +612,51 @@ def test_equality():
     assert bs1 == bs2
 
 
+def test_slice():
+    bs = bistr('  Hello, WORLD!  ').strip().lower().replace('l', 'LL')
+
+    def eager(s, start, stop):
+        alignment = s.alignment.slice_by_modified(start, stop)
+        o0, m0 = alignment[0]
+        return bistr(s.original[alignment.original_slice()], s.modified[start:stop], alignment.shift(-o0, -m0))
+
+    for i in range(len(bs) + 1):
+        for j in range(i, len(bs) + 1):
+            view = bs[i:j]
+            expected = eager(bs, i, j)
+            assert view.alignment == expected.alignment
+            assert view.original == expected.original
+            assert view.modified == expected.modified
+            assert view == expected
+
+            # Slices of slices see the same clamped alignment as the eager slice would
+            for k in range(j - i + 1):
+                for l in range(k, j - i + 1):
+                    assert bs[i:j][k:l] == eager(expected, k, l)
+
+    # Reversed and empty slices
+    for i in range(-len(bs) - 1, len(bs) + 2):
+        for j in range(-len(bs) - 1, len(bs) + 2):
+            start, stop, _ = slice(i, j).indices(len(bs))
+            stop = max(start, stop)
+            assert bs[i:j] == eager(bs, start, stop)
+            assert bs[i:j].modified == bs.modified[i:j]
+            assert bs[2:9][i:j].modified == bs.modified[2:9][i:j]
+
+    assert bistr('hello')[3:1] == bistr('')
+    assert bistr('hello')[3:1].alignment.modified_bounds() == (0, 0)
+    assert bistr('hello')[3:1] + bistr('x') == bistr('x')
+    assert bistr('hello')[1:4][2:1] == bistr('')
+    assert bistr('hello')[5:] == bistr('')
+
+    view = bs[2:7]
+    assert len(view) == 5
+    assert str(view) == "('llo' ⇋ 'LLLLo')"
+    assert repr(view[2:4]) == "bistr('l', 'LL')"
+    pytest.raises(AttributeError, getattr, view, 'foo')
+    pytest.raises(AttributeError, setattr, view, 'original', 'foo')
+
+
 def test_alternative_regex():
     import regex
 
@@ -415,3 +664,11 @@ def test_alternative_regex():
     bs = bs.sub(regex.compile(r'\pS'), lambda m: unicodedata.name(m.group()))
     assert bs[17:25] == bistr('🦊', 'FOX FACE')
     assert bs[46:] == bistr('🐶', 'DOG FACE')
+
+
+def test_infer_parallel(monkeypatch):
+    monkeypatch.setattr('bistring._alignment._PARALLEL_CELLS', 16)
+
+    original = 'Ｔｈｅ ｑｕｉｃｋ， ｂｒｏｗｎ 🦊 ｊｕｍｐｓ ｏｖｅｒ ｔｈｅ ｌａｚｙ 🐶'
+    modified = 'the quick brown fox jumps over the lazy dog'
+    assert bistr.infer(original, modified, workers=2) == bistr.infer(original, modified)
@@ -2,6 +2,7 @@
 # Licensed under the MIT license.
 
 from bistring import bistr, Alignment, BistrBuilder
+import pytest
 
 
 def test_chunk_words():
@@ -124,3 +125,57 @@ def test_append():
     bs = builder.build()
     assert bs[1:4] == bistr('ell', 'ELL', Alignment.identity(3))
     assert bs[7:10] == bistr('ORL', 'orl', Alignment.identity(3))
+
+
+def test_build_twice():
+    builder = BistrBuilder('hello')
+    builder.skip(5)
+    first = builder.build()
+    builder.insert(' world')
+    second = builder.build()
+
+    assert first == bistr('hello')
+    assert second == bistr('hello', 'hello world', Alignment([(0, 0), (1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (5, 11)]))
+
+
+def test_apply_edits():
+    import random
+
+    rng = random.Random(0)
+    text = bistr('The quick, brown fox jumps over the lazy dog.  ' * 20).upper()
+
+    for _ in range(50):
+        positions = sorted(rng.randrange(len(text) + 1) for _ in range(2 * rng.randrange(20)))
+        edits = [(start, end, rng.choice(['', 'x', 'yz'])) for start, end in zip(positions[::2], positions[1::2])]
+
+        manual = BistrBuilder(text)
+        for start, end, repl in edits:
+            manual.skip(start - manual.position)
+            manual.replace(end - start, repl)
+        manual.skip_rest()
+        expected = manual.build()
+
+        builder = BistrBuilder(text)
+        builder.apply_edits(edits)
+        assert builder.build() == expected
+
+        rng.shuffle(edits)
+        assert text.apply_edits(edits, sort=True) == expected
+
+    builder = BistrBuilder('hello')
+    builder.skip(1)
+    builder.apply_edits([(1, 1, 'a'), (1, 1, 'b'), (1, 2, 'E')])
+    assert builder.alignment == Alignment([(0, 0), (1, 1), (1, 2), (1, 3), (2, 4), (3, 5), (4, 6), (5, 7)])
+    assert builder.build() == bistr('hello', 'habEllo', Alignment([(0, 0), (1, 1), (1, 3), (2, 4), (3, 5), (4, 6), (5, 7)]))
+
+    pytest.raises(ValueError, bistr('hello').apply_edits, [(2, 4, 'x'), (3, 5, 'y')])
+    pytest.raises(ValueError, bistr('hello').apply_edits, [(2, 4, 'x'), (3, 5, 'y')], sort=True)
+    pytest.raises(ValueError, bistr('hello').apply_edits, [(3, 5, 'y'), (2, 4, 'x')])
+    pytest.raises(ValueError, bistr('hello').apply_edits, [(3, 2, 'x')])
+    pytest.raises(IndexError, bistr('hello').apply_edits, [(3, 6, 'x')])
+
+    builder = BistrBuilder('hello')
+    pytest.raises(ValueError, builder.apply_edits, [(0, 1, 'H'), (3, 5, 'y'), (2, 4, 'x')])
+    assert builder.position == 5
+    builder.skip_rest()
+    assert builder.build().modified == 'Hely'
@@ -0,0 +1,142 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from bistring import bistr, Alignment, InferCache
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import pickle
+import pytest
+
+
+CALLS = 0
+
+
+def counting_cost(a, b):
+    global CALLS
+    CALLS += 1
+    return int(a != b)
+
+
+def _infer_many(cache, n):
+    return [bistr.infer(f'line {i}', f'LINE #{i}', cache=cache).alignment for i in range(n)]
+
+
+def _check_total(cache):
+    conn = cache._connection()
+    total = conn.execute('SELECT size FROM totals').fetchone()[0]
+    assert total == conn.execute('SELECT TOTAL(size) FROM alignments').fetchone()[0]
+    return total
+
+
+def test_infer_cache(tmp_path):
+    global CALLS
+
+    path = tmp_path / 'alignments.db'
+    cache = InferCache(path)
+
+    expected = Alignment.infer('kitten', 'sitting', counting_cost)
+    CALLS = 0
+    assert Alignment.infer('kitten', 'sitting', counting_cost, cache=cache) == expected
+    assert CALLS > 0
+
+    CALLS = 0
+    assert Alignment.infer('kitten', 'sitting', counting_cost, cache=cache) == expected
+    assert CALLS == 0
+
+    # Different options are cached separately
+    assert Alignment.infer('kitten', 'sitting', counting_cost, anchor=True, cache=cache) == expected
+    assert CALLS > 0
+    assert len(cache) == 2
+
+    text = bistr.infer('🅃🄷🄴 🅀🅄🄸🄲🄺 🄱🅁🄾🅆🄽 🦊', 'the quick brown fox')
+    assert bistr.infer(text.original, text.modified, cache=cache) == text
+    assert bistr.infer(text.original, text.modified, cache=cache) == text
+    assert len(cache) == 3
+
+    # The cache persists, and can be pickled
+    reopened = pickle.loads(pickle.dumps(InferCache(path)))
+    assert len(reopened) == 3
+    CALLS = 0
+    assert Alignment.infer('kitten', 'sitting', counting_cost, cache=reopened) == expected
+    assert CALLS == 0
+
+    pytest.raises(ValueError, Alignment.infer, 'kitten', 'sitting', lambda a, b: int(a != b), cache=cache)
+    assert Alignment.infer('kitten', 'sitting', lambda a, b: int(a != b), cache=cache, cache_key='unit') == expected
+
+    cache.clear()
+    assert len(cache) == 0
+    cache.close()
+
+
+class WeightedCost:
+    def __init__(self, weight):
+        self.weight = weight
+
+    def cost(self, a, b):
+        return 0 if a == b else self.weight
+
+
+def weighted_cost(weight, a, b):
+    return 0 if a == b else weight
+
+
+def test_infer_cache_keys(tmp_path):
+    cache = InferCache(tmp_path / 'alignments.db')
+
+    # Differently configured costs must not share a key
+    pytest.raises(ValueError, Alignment.infer, 'kitten', 'sitting', WeightedCost(1).cost, cache=cache)
+    pytest.raises(ValueError, Alignment.infer, 'kitten', 'sitting', partial(weighted_cost, 1), cache=cache)
+    pytest.raises(ValueError, bistr.infer, 'kitten', 'sitting', partial(weighted_cost, 1), cache=cache)
+    assert len(cache) == 0
+
+    for weight in (1, 3):
+        expected = Alignment.infer('kitten', 'sitting', partial(weighted_cost, weight))
+        assert Alignment.infer('kitten', 'sitting', WeightedCost(weight).cost, cache=cache, cache_key=f'weight={weight}') == expected
+        assert Alignment.infer('kitten', 'sitting', partial(weighted_cost, weight), cache=cache, cache_key=f'weight={weight}') == expected
+    assert len(cache) == 2
+
+    # Sequences of str, int, and bytes are supported
+    assert Alignment.infer(['a', 'b'], ['a', 'c'], cache=cache) == Alignment.infer(['a', 'b'], ['a', 'c'])
+    assert Alignment.infer([1, -1, 1 << 100], [1, 1 << 100], cache=cache) == Alignment.infer([1, -1, 1 << 100], [1, 1 << 100])
+    assert Alignment.infer([b'a', b'b'], [b'b'], cache=cache) == Alignment.infer([b'a', b'b'], [b'b'])
+    assert len(cache) == 5
+
+    # Other elements may not have a stable representation
+    pytest.raises(TypeError, Alignment.infer, [object()], [object()], cache=cache)
+    pytest.raises(TypeError, Alignment.infer, [('a',)], [('a',)], cache=cache)
+    assert len(cache) == 5
+    cache.close()
+
+
+def test_infer_cache_eviction(tmp_path):
+    cache = InferCache(tmp_path / 'alignments.db', max_size=1000)
+
+    results = _infer_many(cache, 100)
+    assert 0 < len(cache) < 100
+    assert 0 < _check_total(cache) <= 1000
+
+    # The most recent results are kept
+    assert bistr.infer('line 99', 'LINE #99', cache=cache).alignment == results[99]
+    assert len(cache) < 100
+
+    # Replacing an entry doesn't count it twice
+    total = _check_total(cache)
+    key = cache._connection().execute('SELECT key FROM alignments ORDER BY used DESC').fetchone()[0]
+    cache._put(key, results[99])
+    assert _check_total(cache) == total
+
+    cache.clear()
+    assert _check_total(cache) == 0
+
+
+def test_infer_cache_processes(tmp_path):
+    cache = InferCache(tmp_path / 'alignments.db')
+
+    with ProcessPoolExecutor(4) as pool:
+        futures = [pool.submit(_infer_many, cache, 50) for _ in range(4)]
+        results = [future.result() for future in futures]
+
+    expected = _infer_many(cache, 50)
+    assert all(result == expected for result in results)
+    assert len(cache) == 50
+    _check_total(cache)
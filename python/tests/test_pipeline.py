@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from bistring import bistr, CacheInfo, Pipeline, TransformCache
+from operator import methodcaller
+import pickle
+import pytest
+
+
+STEPS = [
+    methodcaller('normalize', 'NFKD'),
+    bistr.casefold,
+    methodcaller('sub', r'[^\w\s]+', ''),
+    methodcaller('sub', r'\s+', ' '),
+    bistr.strip,
+    methodcaller('replace', 'the', 'THE'),
+]
+
+
+def test_pipeline():
+    text = bistr('  𝕿𝖍𝖊 𝖖𝖚𝖎𝖈𝖐,\t𝖇𝖗𝖔𝖜𝖓 𝖋𝖔𝖝 𝖏𝖚𝖒𝖕𝖘 𝖔𝖛𝖊𝖗 𝖙𝖍𝖊 𝖑𝖆𝖟𝖞 𝖉𝖔𝖌!  ').upper()
+
+    expected = text
+    for step in STEPS:
+        expected = step(expected)
+
+    pipeline = Pipeline(*STEPS)
+    assert pipeline(text) == expected
+    assert text.pipe(*STEPS) == expected
+    assert pipeline(text.original) == bistr(text.original).pipe(*STEPS)
+
+    assert Pipeline()(text) == text
+    assert text.pipe(*STEPS[:1]) == STEPS[0](text)
+
+    clone = pickle.loads(pickle.dumps(pipeline))
+    assert clone(text) == expected
+
+    pytest.raises(ValueError, bistr('Hello').pipe, lambda s: bistr(s.modified.lower()))
+
+
+def test_transform_cache():
+    cache = TransformCache(2)
+    casefold = bistr.casefold
+
+    texts = [bistr('Straße'), bistr('STRASSE'), bistr('Straße').upper(), bistr('Hello')]
+    expected = [text.casefold() for text in texts]
+
+    assert cache.apply(texts[0], casefold) == expected[0]
+    assert cache.apply(texts[1], casefold) == expected[1]
+    assert cache.apply(texts[2], casefold) == expected[2]
+    assert cache.cache_info() == CacheInfo(hits=1, misses=2, evictions=0, maxsize=2, currsize=2)
+
+    assert cache.apply(texts[3], casefold) == expected[3]
+    assert cache.cache_info() == CacheInfo(hits=1, misses=3, evictions=1, maxsize=2, currsize=2)
+
+    # 'Straße' was evicted, but 'STRASSE' was used more recently
+    assert cache.apply(texts[1].original, casefold) == expected[1]
+    assert cache.apply(texts[0].original, casefold) == expected[0]
+    assert cache.cache_info() == CacheInfo(hits=2, misses=4, evictions=2, maxsize=2, currsize=2)
+
+    cache.cache_clear()
+    assert cache.cache_info() == CacheInfo(hits=0, misses=0, evictions=0, maxsize=2, currsize=0)
+
+    pytest.raises(ValueError, TransformCache, -1)
+
+
+def test_pipeline_cache():
+    cache = TransformCache()
+    pipeline = Pipeline(*STEPS, cache=cache)
+    uncached = Pipeline(*STEPS)
+
+    texts = [bistr('  The  Quick, brown fox  '), bistr('  The  Quick, brown fox  ').upper(), bistr('the quick, brown fox')]
+    for _ in range(3):
+        for text in texts:
+            assert pipeline(text) == uncached(text)
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses) == (6, 3)
+
+    clone = pickle.loads(pickle.dumps(pipeline))
+    assert clone(texts[0]) == uncached(texts[0])
+    assert clone._cache.cache_info() == CacheInfo(hits=0, misses=1, evictions=0, maxsize=4096, currsize=1)
@@ -0,0 +1,135 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT license.
+
+from bistring import bistr, BistrBuilder, Replacer, RewriteRules
+import pickle
+import pytest
+import random
+import re
+
+
+def _replace_slowly(text: bistr, replacements: dict) -> bistr:
+    builder = BistrBuilder(text)
+    while not builder.is_complete:
+        for length in range(builder.remaining, 0, -1):
+            old = builder.peek(length)
+            if old in replacements:
+                builder.replace(length, replacements[old])
+                break
+        else:
+            builder.skip(1)
+    return builder.build()
+
+
+def test_replace_many():
+    rng = random.Random(0)
+
+    for _ in range(50):
+        patterns = {''.join(rng.choice('abc') for _ in range(rng.randrange(1, 5))) for _ in range(rng.randrange(10))}
+        replacements = {old: rng.choice(['', 'x', 'yz', old.upper()]) for old in patterns}
+        replacer = Replacer(replacements)
+
+        text = bistr(''.join(rng.choice('abcd') for _ in range(50))).upper().lower()
+        expected = _replace_slowly(text, replacements)
+        assert text.replace_many(replacements) == expected
+        assert text.replace_many(replacer) == expected
+        assert replacer(text) == expected
+
+    assert bistr('hello').replace_many({}) == bistr('hello')
+    pytest.raises(ValueError, Replacer, {'': 'x'})
+
+
+def test_replace_many_builder():
+    builder = BistrBuilder('aaa aaa')
+    builder.skip(2)
+    builder.replace_many({'a': 'b', 'aa': 'c'})
+    assert builder.build().modified == 'aab cb'
+
+
+def test_pickle_replacer():
+    replacer = Replacer({'😂': ':joy:', '😂😂': ':joy: x2', '🐶': ':dog:'})
+    clone = pickle.loads(pickle.dumps(replacer))
+    text = bistr('😂😂😂 🐶')
+    assert clone(text) == replacer(text)
+    assert clone(text).modified == ':joy: x2:joy: :dog:'
+
+
+def _sub_slowly(text: bistr, rules: list) -> bistr:
+    builder = BistrBuilder(text)
+    while not builder.is_complete:
+        for regex, repl in rules:
+            match = re.compile(regex).match(builder.current, builder.position)
+            if match:
+                builder.replace(match.end() - match.start(), match.expand(repl))
+                break
+        else:
+            builder.skip(1)
+    return builder.build()
+
+
+def test_sub_all():
+    rng = random.Random(0)
+
+    for _ in range(50):
+        rules = [(rng.choice(['a+', 'ab', '[bc]d', 'b', '(a)(b)?c', 'dd?']), rng.choice(['', 'x', r'<\g<0>>'])) for _ in range(rng.randrange(1, 5))]
+        text = bistr(''.join(rng.choice('abcd') for _ in range(50)))
+        expected = _sub_slowly(text, rules)
+        assert text.sub_all(rules) == expected
+        assert text.sub_all(RewriteRules(rules)) == expected
+
+    assert bistr('hello').sub_all([]) == bistr('hello')
+
+
+def test_rewrite_rules():
+    rules = RewriteRules([
+        (re.compile('HELLO', re.IGNORECASE), 'hi'),
+        (re.compile(r"""
+            (?P<first>\w+) \s+ (?P<last>\w+)  # A name
+        """, re.VERBOSE), r'\g<last>, \g<first>'),
+        (r'(\d)(\d)', lambda m: m.group(2) + m.group(1)),
+        (r'\d', lambda m: str(len(m.groups()))),
+    ])
+    assert rules('Hello  John Smith 123').modified == 'hi  Smith, John 210'
+
+    builder = BistrBuilder('Hello world hello')
+    builder.skip(6)
+    builder.replace_all_rules(rules)
+    assert builder.build().modified == 'Hello hello, world'
+
+    pytest.raises(re.error, RewriteRules, [('(?P<x>a)', ''), ('(?P<x>b)', '')])
+
+
+def test_rewrite_rules_flags():
+    assert bistr('FOO foo').sub_all([('(?i)foo', 'X')]).modified == 'X X'
+    assert bistr('Foo BAR bar').sub_all([(re.compile('foo', re.I), 'X'), ('(?i)bar', 'Y')]).modified == 'X Y Y'
+    assert bistr('a\nB\nb').sub_all([('(?m)(?i)^b', 'X'), ('(?s)a.', 'Y')]).modified == 'YX\nX'
+
+
+def test_rewrite_rules_backreferences():
+    rules = [(r'(x)', 'X'), (r'(\w)\1', 'D')]
+    assert bistr('aa bb').sub_all(rules).modified == 'D D'
+    assert bistr('aa bb').sub(r'(x)', 'X').sub(r'(\w)\1', 'D').modified == 'D D'
+
+    rules = [(r'(?P<c>\w)(?P=c)', 'D'), (r'(a)(b)\2', r'\1')]
+    assert bistr('abb aab').sub_all(rules).modified == 'a Db'
+
+    # Conditional references also depend on the group numbering
+    rules = [(r'(x)', 'X'), (r'(<)?\w+(?(1)>)', 'W')]
+    assert bistr('<ab> cd <ef x').sub_all(rules).modified == 'W W <W X'
+
+
+def test_rewrite_rules_regex_module():
+    regex = pytest.importorskip('regex')
+
+    assert bistr('a+b=c').sub_all([(regex.compile(r'\pS'), ' ')]).modified == 'a b c'
+    assert bistr('a+b=c').sub_all([(regex.compile(r'\pS'), ' '), ('[ac]', 'x')]).modified == 'x b x'
+
+    # Searching for each rule separately gives the same result as the combined regex
+    rng = random.Random(0)
+    for _ in range(100):
+        rules = [(rng.choice(['a+', 'ab', '[bc]d', 'b', '(a)(b)?c', 'dd?', 'x*', '(?=d)', 'c|']), rng.choice(['', 'x', r'<\g<0>>'])) for _ in range(rng.randrange(1, 5))]
+        text = bistr(''.join(rng.choice('abcd') for _ in range(30)))
+        expected = text.sub_all(rules)
+        assert text.sub_all([(regex.compile(pattern), repl) for pattern, repl in rules]) == expected
+        assert text.sub_all([(re.compile(pattern), repl) for pattern, repl in rules] + [(r'(q)\1', '')]) == expected
+
@@ -111,6 +111,25 @@ def test_word_tokenizer():
     assert len(tokens.slice_by_text(3, 13)) == 3
 
 
+def test_shared_break_iterators():
+    from bistring import SentenceTokenizer, WordTokenizer
+    from concurrent.futures import ThreadPoolExecutor
+
+    first = WordTokenizer('en_US')
+    second = WordTokenizer('en_US')
+    assert first._break_iterator() is second._break_iterator()
+    assert first._break_iterator() is not SentenceTokenizer('en_US')._break_iterator()
+    assert first._break_iterator() is not WordTokenizer('th_TH')._break_iterator()
+
+    texts = [' '.join(['word'] * n) for n in range(1, 200)]
+    expected = [len(first.tokenize(text)) for text in texts]
+
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(lambda text: len(second.tokenize(text)), texts)) == expected
+        others = set(executor.map(lambda _: id(second._break_iterator()), range(100)))
+        assert id(first._break_iterator()) not in others
+
+
 def test_sentence_tokenizer():
     from bistring import SentenceTokenizer
 
@@ -124,3 +143,27 @@ def test_sentence_tokenizer():
     assert len(tokens) == 2
     assert tokens[0].text == text[:33]
     assert tokens[1].text == text[33:]
+
+
+def test_bounds_many():
+    from bistring import WordTokenizer
+
+    text = bistr('  The quick, brown fox jumps over the lazy dog  ').strip().upper()
+    tokens = WordTokenizer('en_US').tokenize(text)
+
+    spans = [(i, j) for i in range(len(tokens) + 1) for j in range(i, len(tokens) + 1)]
+    starts, stops = map(list, zip(*spans))
+    assert list(zip(*tokens.text_bounds_many(starts, stops))) == [tokens.text_bounds(i, j) for i, j in spans]
+    assert list(zip(*tokens.original_bounds_many(starts, stops))) == [tokens.original_bounds(i, j) for i, j in spans]
+
+    spans = [(i, j) for i in range(len(text) + 1) for j in range(i, len(text) + 1)]
+    starts, stops = map(list, zip(*spans))
+    assert list(zip(*tokens.bounds_for_text_many(starts, stops))) == [tokens.bounds_for_text(i, j) for i, j in spans]
+
+    spans = [(i, j) for i in range(len(text.original) + 1) for j in range(i, len(text.original) + 1)]
+    starts, stops = map(list, zip(*spans))
+    assert list(zip(*tokens.bounds_for_original_many(starts, stops))) == [tokens.bounds_for_original(i, j) for i, j in spans]
+
+    first, last, valid = tokens.original_bounds_many([0, 0], [1, len(tokens) + 1], mask=True)
+    assert list(valid) == [True, False]
+    assert (first[0], last[0]) == tokens.original_bounds(0, 1)